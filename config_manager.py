@@ -3,6 +3,12 @@ import os
 import threading
 from typing import Any, Dict, Optional
 
+# orjson (C) é ~2-3x mais rápido que o json da stdlib; opcional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class ConfigurationManager:
     """
     Singleton class to manage application configuration.
@@ -116,9 +122,13 @@ class ConfigurationManager:
         Load configuration from the JSON file.
         """
         try:
-            with open(self._config_file, 'r', encoding='utf-8') as f:
-                self._config_data = json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
+            if orjson is not None:
+                with open(self._config_file, 'rb') as f:
+                    self._config_data = orjson.loads(f.read())
+            else:
+                with open(self._config_file, 'r', encoding='utf-8') as f:
+                    self._config_data = json.load(f)
+        except (ValueError, IOError) as e:
             print(f"Error loading config: {e}")
             # Fallback to defaults if load fails
             self._create_default_config()
@@ -128,8 +138,12 @@ class ConfigurationManager:
         Save current configuration to the JSON file.
         """
         try:
-            with open(self._config_file, 'w', encoding='utf-8') as f:
-                json.dump(self._config_data, f, indent=4, ensure_ascii=False)
+            if orjson is not None:
+                with open(self._config_file, 'wb') as f:
+                    f.write(orjson.dumps(self._config_data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(self._config_file, 'w', encoding='utf-8') as f:
+                    json.dump(self._config_data, f, indent=4, ensure_ascii=False)
         except IOError as e:
             print(f"Error saving config: {e}")
 
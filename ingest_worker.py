@@ -1,17 +1,42 @@
 """
 Subprocess worker for ChromaDB operations.
 Runs in a separate process to avoid DLL conflicts with PyQt6's SQLite.
+
+Supports two modes: the original one-shot mode (one JSON request on
+stdin, one JSON response on stdout) and a persistent --server mode that
+handles newline-delimited JSON requests over the same pipe, amortizing
+interpreter startup and the heavy chroma/langchain imports across calls.
 """
 import sys
 import json
 import os
 import traceback
 
+# Repositories keyed by connection params; reused across --server requests
+_repo_cache = {}
 
-def main():
+
+def _get_repo(chroma_dir, model_name, provider, api_key, ollama_url):
+    # Import here, inside the clean subprocess
+    from rag_repository import VectorStoreRepository
+
+    key = (chroma_dir, model_name, provider, api_key, ollama_url)
+    repo = _repo_cache.get(key)
+    if repo is None:
+        repo = VectorStoreRepository(
+            persist_directory=chroma_dir,
+            model_name=model_name,
+            provider=provider,
+            api_key=api_key,
+            base_url=ollama_url
+        )
+        _repo_cache[key] = repo
+    return repo
+
+
+def handle_request(data):
+    """Process one request dict and return the response dict."""
     try:
-        # Read JSON from stdin to avoid Windows shell escaping issues
-        data = json.loads(sys.stdin.read())
         action = data["action"]
         chroma_dir = data.get("chroma_dir") or None
         model_name = data.get("model_name", "nomic-embed-text")
@@ -21,62 +46,50 @@ def main():
 
         if action == "clear":
             import shutil
+            # Drop cached repos holding handles into the directory being reset
+            _repo_cache.clear()
             if chroma_dir and os.path.exists(chroma_dir):
                 shutil.rmtree(chroma_dir)
                 os.makedirs(chroma_dir, exist_ok=True)
-                print(json.dumps({"ok": True, "result": "Banco de dados resetado completamente (inclusive dimensões)."}))
-            else:
-                print(json.dumps({"ok": True, "result": "Diretório não encontrado, nada para limpar."}))
-            return
-
-        # Import here, inside the clean subprocess
-        from rag_repository import VectorStoreRepository
-        
-        repo = VectorStoreRepository(
-            persist_directory=chroma_dir, 
-            model_name=model_name,
-            provider=provider,
-            api_key=api_key,
-            base_url=ollama_url
-        )
+                return {"ok": True, "result": "Banco de dados resetado completamente (inclusive dimensões)."}
+            return {"ok": True, "result": "Diretório não encontrado, nada para limpar."}
+
+        repo = _get_repo(chroma_dir, model_name, provider, api_key, ollama_url)
 
         if action == "ingest":
             file_paths = data.get("file_paths")
             if file_paths is None:
                 file_paths = [data.get("file_path")]
-            
-            results = []
-            errors = []
-            for fp in file_paths:
-                if not fp:
-                    continue
-                try:
-                    res = repo.ingest_file(fp)
-                    results.append(res)
-                except Exception as e:
-                    errors.append(f"{os.path.basename(fp)}: {str(e)}")
-            
-            if not results and errors:
-                print(json.dumps({"ok": False, "error": " | ".join(errors)}))
-                return
-                
-            total_chunks = sum(r.get("chunks_count", 0) for r in results)
-            
-            if len(results) == 1:
-                filename_display = results[0].get("filename", "")
-            else:
-                filename_display = f"{len(results)} arquivos"
-                
+            file_paths = [fp for fp in file_paths if fp]
+
+            if len(file_paths) == 1:
+                res = repo.ingest_file(file_paths[0])
+                return {
+                    "ok": True,
+                    "result": {
+                        "chunks_count": res.get("chunks_count", 0),
+                        "filename": res.get("filename", "")
+                    }
+                }
+
+            # Vários arquivos: parse/split paralelizado e uma escrita só
+            res = repo.ingest_files(file_paths)
+            errors = res.get("errors", [])
+
+            if res.get("files_count", 0) == 0 and errors:
+                return {"ok": False, "error": " | ".join(errors)}
+
+            filename_display = f"{res.get('files_count', 0)} arquivos"
             if errors:
                 filename_display += f" (com Falhas em {len(errors)})"
-                
-            print(json.dumps({
-                "ok": True, 
+
+            return {
+                "ok": True,
                 "result": {
-                    "chunks_count": total_chunks,
+                    "chunks_count": res.get("chunks_count", 0),
                     "filename": filename_display
                 }
-            }))
+            }
 
         elif action == "query":
             query_text = data["query"]
@@ -84,31 +97,65 @@ def main():
             results = repo.query_context(query_text, n_results=k)
             # Convert Document objects to dicts
             docs = [{"page_content": d.page_content, "metadata": d.metadata} for d in results]
-            print(json.dumps({"ok": True, "result": docs}))
+            return {"ok": True, "result": docs}
 
         elif action == "list":
             result = repo.list_documents()
-            print(json.dumps({"ok": True, "result": result}))
+            return {"ok": True, "result": result}
 
         elif action == "delete":
             filename = data["filename"]
             result = repo.delete_document(filename)
             if result.get("ok"):
-                print(json.dumps({"ok": True, "result": result}))
-            else:
-                print(json.dumps(result))
+                return {"ok": True, "result": result}
+            return result
 
         elif action == "stats":
             result = repo.get_stats()
-            print(json.dumps({"ok": True, "result": result}))
+            return {"ok": True, "result": result}
 
         else:
-            print(json.dumps({"ok": False, "error": f"Unknown action: {action}"}))
+            return {"ok": False, "error": f"Unknown action: {action}"}
 
     except Exception as e:
         tb = traceback.format_exc()
-        print(json.dumps({"ok": False, "error": str(e), "traceback": tb}))
+        return {"ok": False, "error": str(e), "traceback": tb}
+
+
+def main():
+    # Read JSON from stdin to avoid Windows shell escaping issues
+    data = json.loads(sys.stdin.read())
+    print(json.dumps(handle_request(data)))
+
+
+def serve():
+    """Persistent mode: one JSON request per stdin line, one response per stdout line."""
+    real_stdout = sys.stdout
+    # Prints vindos de bibliotecas não podem corromper o protocolo
+    sys.stdout = sys.stderr
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        action = None
+        try:
+            data = json.loads(line)
+            action = data.get("action")
+            response = handle_request(data)
+        except Exception as e:
+            response = {"ok": False, "error": str(e), "traceback": traceback.format_exc()}
+        real_stdout.write(json.dumps(response) + "\n")
+        real_stdout.flush()
+        if action == "clear":
+            # O chromadb memoriza o System por diretório no processo inteiro
+            # (e os repos seguram conexões SQLite nos arquivos removidos);
+            # encerrar aqui garante handles novos — quem chama respawna o
+            # worker na próxima requisição
+            break
 
 
 if __name__ == "__main__":
-    main()
+    if "--server" in sys.argv[1:]:
+        serve()
+    else:
+        main()
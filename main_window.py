@@ -9,12 +9,16 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QIcon
 from PyQt6.QtCore import pyqtSlot, QTimer
+
 from config_manager import ConfigurationManager
 from log_observer import LogObserver
 from async_worker import AsyncBridgeWorker
 from telegram_controller import TelegramBotController
 from ollama_client import OllamaAdapter
 
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+_WORKER_SCRIPT = os.path.join(_MODULE_DIR, "ingest_worker.py")
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -22,9 +26,9 @@ class MainWindow(QMainWindow):
         self.resize(900, 700)
         
         # Set Window Icon
-        icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icon.png")
+        icon_path = os.path.join(_MODULE_DIR, "icon.png")
         if not os.path.exists(icon_path):
-             icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icon.ico")
+             icon_path = os.path.join(_MODULE_DIR, "icon.ico")
         
         if os.path.exists(icon_path):
             self.setWindowIcon(QIcon(icon_path))
@@ -661,9 +665,11 @@ class MainWindow(QMainWindow):
             self.input_chroma_dir.setText(dir_path)
 
     def select_file(self):
-        fnames, _ = QFileDialog.getOpenFileNames(self, "Abrir Arquivos", "", "Documentos (*.pdf *.txt *.csv *.md *.docx)")
+        start_dir = self.config_manager.get("last_ingest_dir", "")
+        fnames, _ = QFileDialog.getOpenFileNames(self, "Abrir Arquivos", start_dir, "Documentos (*.pdf *.txt *.csv *.md *.docx)")
         if fnames:
             self.selected_files = fnames
+            self.config_manager.update_batch({"last_ingest_dir": os.path.dirname(fnames[0])})
             if len(fnames) == 1:
                 self.lbl_file.setText(os.path.basename(fnames[0]))
             else:
@@ -701,8 +707,7 @@ class MainWindow(QMainWindow):
             
         # Ensure file is in 'arquivos' folder for download availability
         import shutil
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        arquivos_path = os.path.join(base_dir, "arquivos")
+        arquivos_path = os.path.join(_MODULE_DIR, "arquivos")
         os.makedirs(arquivos_path, exist_ok=True)
         
         target_fnames = []
@@ -734,8 +739,7 @@ class MainWindow(QMainWindow):
             "api_key": api_key,
             "ollama_url": ollama_url
         })
-        worker_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ingest_worker.py")
-        
+
         def sync_ingest():
             """Run in subprocess to avoid PyQt6/SQLite DLL conflicts."""
             import sys
@@ -744,13 +748,13 @@ class MainWindow(QMainWindow):
             if getattr(sys, 'frozen', False):
                 cmd = [sys.executable, "--worker"]
             else:
-                cmd = [sys.executable, worker_script]
+                cmd = [sys.executable, _WORKER_SCRIPT]
                 
             result = subprocess.run(
                 cmd,
                 input=worker_data,
                 capture_output=True, text=True,
-                cwd=os.path.dirname(os.path.abspath(__file__))
+                cwd=_MODULE_DIR
             )
             if result.returncode != 0:
                 error_msg = result.stderr.strip() if result.stderr else "Processo encerrado inesperadamente"
@@ -802,8 +806,7 @@ class MainWindow(QMainWindow):
             "api_key": api_key,
             "ollama_url": ollama_url
         })
-        worker_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ingest_worker.py")
-        
+
         def sync_clear():
             import sys
             
@@ -811,13 +814,13 @@ class MainWindow(QMainWindow):
             if getattr(sys, 'frozen', False):
                 cmd = [sys.executable, "--worker"]
             else:
-                cmd = [sys.executable, worker_script]
+                cmd = [sys.executable, _WORKER_SCRIPT]
                 
             result = subprocess.run(
                 cmd,
                 input=worker_data,
                 capture_output=True, text=True,
-                cwd=os.path.dirname(os.path.abspath(__file__))
+                cwd=_MODULE_DIR
             )
             if result.returncode != 0:
                 error_msg = result.stderr.strip() if result.stderr else "Processo encerrado inesperadamente"
@@ -911,8 +914,7 @@ class MainWindow(QMainWindow):
             "embedding_provider": provider,
             "api_key": api_key
         })
-        worker_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ingest_worker.py")
-        
+
         def sync_list():
             import sys
             
@@ -920,13 +922,13 @@ class MainWindow(QMainWindow):
             if getattr(sys, 'frozen', False):
                 cmd = [sys.executable, "--worker"]
             else:
-                cmd = [sys.executable, worker_script]
+                cmd = [sys.executable, _WORKER_SCRIPT]
                 
             result = subprocess.run(
                 cmd,
                 input=worker_data,
                 capture_output=True, text=True,
-                cwd=os.path.dirname(os.path.abspath(__file__))
+                cwd=_MODULE_DIR
             )
             if result.returncode != 0:
                 return []
@@ -993,15 +995,14 @@ class MainWindow(QMainWindow):
             "embedding_provider": provider,
             "api_key": api_key
         })
-        worker_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ingest_worker.py")
-        
+
         def sync_delete():
             import sys
             result = subprocess.run(
-                [sys.executable, worker_script],
+                [sys.executable, _WORKER_SCRIPT],
                 input=worker_data,
                 capture_output=True, text=True,
-                cwd=os.path.dirname(os.path.abspath(__file__))
+                cwd=_MODULE_DIR
             )
             if result.returncode != 0:
                 return {"ok": False, "error": "Process failed"}
@@ -1,6 +1,8 @@
 import asyncio
 import os
 import sys
+import time
+from collections import deque
 
 from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal, Vertical, VerticalScroll
@@ -10,159 +12,134 @@ from textual.binding import Binding
 from config_manager import ConfigurationManager
 from telegram_controller import TelegramBotController
 
+# Caminhos resolvidos uma vez no import (evita abspath/stat por clique)
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+_WORKER_SCRIPT = os.path.join(_BASE_DIR, "ingest_worker.py")
+_ARQUIVOS_DIR = os.path.join(_BASE_DIR, "arquivos")
+
+# inotify permite dormir até o kernel sinalizar mudança no log (Linux).
+# Sem ele (ex: Windows), o tail recai no polling com sleep.
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
+class MenuButtonGroup(Vertical):
+    """Grupo de configuração de um botão do menu (habilitado/texto/ação/parâmetro).
+
+    Uma classe única para os 5 slots: o Textual resolve os estilos por
+    classe de widget, então o custo de casar seletores é pago uma vez e
+    não uma vez por grupo instanciado.
+    """
+
+    def __init__(self, idx: int):
+        super().__init__(classes="menu-group")
+        self.idx = idx
+
+    def compose(self) -> ComposeResult:
+        i = self.idx
+        yield Label(f"Botão {i+1}", classes="menu-label-bold")
+        with Horizontal(classes="menu-row"):
+            yield Label("Habilitado:")
+            yield Switch(id=f"chk_enabled_{i}", value=True)
+        yield Label("Texto do Botão:")
+        yield Input(id=f"txt_label_{i}", placeholder="Ex: Informações")
+        yield Label("Tipo de Ação:")
+        yield Select(
+            options=[
+                ("Texto Fixo (Configurado aqui)", "fixed_text"),
+                ("Ler de Arquivo Texto (Em arquivos/)", "text_file"),
+                ("Upload de Arquivos (Pelo prefixo)", "file_upload")
+            ],
+            id=f"cmb_action_{i}"
+        )
+        yield Label("Parâmetro (Texto/Arquivo/Prefixo):")
+        yield TextArea(id=f"txt_param_{i}")
+
+
 class BotTerminalUI(App):
     """Uma interface de terminal (TUI) para gerenciar o Bot do Telegram."""
 
     # Título da TUI
     TITLE = "Ollama Telegram Bot - Gerenciador TUI"
     
-    # CSS para garantir um fundo legível e "limpo" num terminal, e estruturar painéis.
-    CSS = """
-    Screen {
-        background: #0a0a0a;  /* Fundo preto profundo */
-        color: #e0e0e0;       /* Texto cinza claro */
-    }
-
-    Header {
-        background: #1a4a75;
-        color: #ffffff;
-        text-style: bold;
-    }
-
-    Footer {
-        background: #1a1a1a;
-        color: #888888;
-    }
-
-    TabPane {
-        padding: 1;
-        background: #0a0a0a;
-    }
-    
-    .panel {
-        border: solid #2b5b84;
-        padding: 1;
-        margin: 1 0;
-        background: #121212;
-    }
-
-    Log {
-        height: 1fr;
-        border: double #2b5b84;
-        background: #000000; 
-        color: #00ff00;
-    }
-
-    .status-label {
-        text-style: bold;
-        margin-bottom: 1;
-        padding: 1;
-        background: #1a1a1a;
-        border: tall #333333;
-        color: #ffffff;
-        width: 100%;
-    }
-    /* Estratégia Visual Flat: Sem bordas complexas que geram artefatos ou caracteres engolidos 
-       no momento da renderização, focando num design sólido de alta legibilidade. */
-    Button {
-        margin: 1 2;
-        border: none;
-        background: #333333; /* Cor base para botões padrão não coloridos */
-        color: #ffffff;
-    }
-
-    Button.-primary {
-        background: #1976d2;
-        color: white;
-    }
-
-    Button.-success {
-        background: #388e3c;
-        color: white;
-    }
-
-    Button.-error {
-        background: #d32f2f;
-        color: white;
-    }
-
-    Button.-warning {
-        background: #f57c00;
-        color: white;
-    }
-
-    Button:disabled {
-        background: #424242;
-        color: #9e9e9e;
-    }
-
-    #controls-container {
-        height: auto;
-        padding: 1;
-        background: #121212;
-        border-bottom: solid #2b5b84;
-    }
-
-    .panel-title {
-        text-style: bold;
-        color: #2b5b84;
-        margin-top: 1;
-    }
-
-    .hidden-label {
-        display: none;
-    }
-
-    /* Menu Principal CSS */
-    #tab-menu {
-        overflow-y: auto;
-    }
-    .menu-group {
-        border: solid #2b5b84;
-        margin-top: 1;
-        margin-bottom: 1;
-        background: #111111;
-        padding: 1;
-        height: auto;
-    }
-    .menu-label-bold {
-        text-style: bold;
-        color: #ffb74d;
-    }
-    .menu-row {
-        height: auto;
-    }
-    Input, Select, TextArea, Switch {
-        background: #2a2a2a;
-        color: #f0f0f0;
-        border: solid #555555;
-        margin-bottom: 1;
-    }
-    Input:focus, Select:focus, TextArea:focus {
-        border: solid #2196f3;
-        background: #333333;
-    }
-    TextArea {
-        height: 6;
-    }
-    #lbl-save-status {
-        margin-top: 1;
-        text-style: bold;
-    }
-    """
+    # CSS num arquivo .tcss: o Textual faz cache do parse em disco (mtime),
+    # em vez de re-tokenizar a string inteira a cada criação da classe.
+    CSS_PATH = "monitor_tui.tcss"
 
     BINDINGS = [
         Binding("s", "quit", "Sair", show=True),
         Binding("ctrl+c", "quit", "Sair"),
     ]
 
+    # Campos "simples" da aba Configuração: (chave no config, id do widget,
+    # atributo do widget, conversor, default). Uma tabela única dirige o load
+    # e o save, em vez de duas sequências duplicadas de lookups.
+    GENERAL_FIELDS = [
+        ("telegram_token", "cfg_telegram_token", "value", str, ""),
+        ("admin_id", "cfg_admin_id", "value", str, ""),
+        ("ollama_url", "cfg_ollama_url", "value", str, "http://127.0.0.1:11434"),
+        ("openrouter_key", "cfg_openrouter_key", "value", str, ""),
+        ("system_prompt", "cfg_sys_prompt", "text", str, ""),
+        ("temperature", "cfg_temperature", "value", float, 0.7),
+        ("max_tokens", "cfg_max_tokens", "value", int, 2048),
+        ("rag_k", "cfg_rag_k", "value", int, 8),
+        ("chat_history_size", "cfg_chat_history", "value", int, 5),
+        ("rate_limit_per_minute", "cfg_rate_limit", "value", int, 10),
+        ("chroma_dir", "cfg_chroma_dir", "value", str, ""),
+        ("welcome_message", "cfg_welcome_msg", "text", str, ""),
+    ]
+
+    # Strings de status pré-montadas (evita reinterpolar markup a cada troca)
+    STATUS_EXTERNAL = "Status: [yellow]RODANDO EM BACKGROUND (start_rp4)[/yellow]"
+    STATUS_RUNNING = "Status: [green]RODANDO[/green]"
+    STATUS_STOPPED = "Status: [red]PARADO[/red]"
+
     def __init__(self):
         super().__init__()
         self.telegram_controller = None
         self.bot_task = None
         self.log_file_path = "bot.log"
         self._tail_task = None
-        self.config_manager = ConfigurationManager()
+        # Carregado em on_mount (fora do caminho do primeiro paint)
+        self.config_manager = None
+        # Chunks de log pendentes do tail, consumidos por frame no flush
+        self._log_buffer = deque(maxlen=5000)
+        # Último estado aplicado na UI; evita re-render quando nada mudou
+        self._last_status = None
+        # O IP do Tailscale não muda durante a sessão; resolve uma vez só
+        self._cached_tailscale_ip = None
+        self._cached_local_ip = None
+        # IP público com TTL: evita re-consultar a api.ipify.org a cada refresh
+        self._cached_public_ip = None
+        self._public_ip_ts = 0.0
+        # Cliente HTTP persistente (pool/TLS reutilizados entre chamadas)
+        self._http = None
+        # pidfd do bot externo: o kernel avisa na hora em que o processo morre
+        self._pidfd = None
+        self._pidfd_pid = None
+        # Cache (mtime_ns, pid) do lock /tmp/telegram-bot.pid: o arquivo só
+        # é relido quando o stat acusa mtime novo
+        self._pid_cache = (0, -1)
+        # Task pendente do save debounced do menu
+        self._save_task = None
+        # Abas pesadas (menu e configuração) construídas sob demanda
+        self._built_tabs = set()
+        self._menu_widgets = []
+        self._cfg_widgets = {}
+        # Sinal único de shutdown observado pelas corrotinas de fundo
+        self._shutdown = asyncio.Event()
+        # Worker de ingestão persistente (modo --server), criado sob demanda
+        self._worker_proc = None
+        self._worker_lock = asyncio.Lock()
+        # Linhas atuais da tabela da Base (nome -> RowKey) para refresh por diff
+        self._kb_rows = {}
+        # Estado do tail de logs (fd cru do arquivo + instância inotify, se houver)
+        self._log_fd = None
+        self._log_ino = None
+        self._log_tail_buf = bytearray()
+        self._inotify = None
+        self._log_dir_wd = None
 
     def compose(self) -> ComposeResult:
         """Cria o layout da TUI."""
@@ -191,11 +168,11 @@ class BotTerminalUI(App):
                 # Aba 2: Terminal de Logs
                 with TabPane("Terminal de Logs", id="tab-controls"):
                     with Vertical():
-                        yield Label("Status: VERIFICANDO...", id="lbl-status", classes="status-label hidden-label")
                         yield Static("📺 Console (bot.log):", classes="panel-title")
                         
                         # Painel de Log (ecoa em tempo real)
-                        self.log_view = Log(id="log-view")
+                        # max_lines limita a memória num bot que roda por semanas
+                        self.log_view = Log(id="log-view", max_lines=2000)
                         yield self.log_view
 
                 # Aba 3: Menu Principal
@@ -204,29 +181,10 @@ class BotTerminalUI(App):
                         yield Static("⚙️ Configuração dos Botões do Menu", classes="panel-title")
                         yield Button("💾 Salvar Alterações", id="btn-save-menu", variant="success")
                         yield Label("", id="lbl-save-status", classes="status-label")
-                        
-                        for i in range(5):
-                            with Vertical(classes="menu-group"):
-                                yield Label(f"Botão {i+1}", classes="menu-label-bold")
-                                with Horizontal(classes="menu-row"):
-                                    yield Label("Habilitado:")
-                                    yield Switch(id=f"chk_enabled_{i}", value=True)
-                                
-                                yield Label("Texto do Botão:")
-                                yield Input(id=f"txt_label_{i}", placeholder="Ex: Informações")
-                                
-                                yield Label("Tipo de Ação:")
-                                yield Select(
-                                    options=[
-                                        ("Texto Fixo (Configurado aqui)", "fixed_text"),
-                                        ("Ler de Arquivo Texto (Em arquivos/)", "text_file"),
-                                        ("Upload de Arquivos (Pelo prefixo)", "file_upload")
-                                    ],
-                                    id=f"cmb_action_{i}"
-                                )
-                                
-                                yield Label("Parâmetro (Texto/Arquivo/Prefixo):")
-                                yield TextArea(id=f"txt_param_{i}")
+
+                        # Os 5 grupos (~40 widgets) são montados sob demanda
+                        # na primeira ativação da aba; ver _build_menu_tab
+                        yield Vertical(id="menu-host")
                 
                 # Aba 4: Base de Conhecimento
                 with TabPane("Base de Conhecimento", id="tab-kb"):
@@ -234,8 +192,8 @@ class BotTerminalUI(App):
                         yield Static("📚 Gerenciamento da Base de Conhecimento (RAG)", classes="panel-title")
                         
                         with Horizontal(classes="menu-row"):
-                            curr_dir = os.path.abspath('.')
-                            yield Input(id="kb_filepath", placeholder=f"{curr_dir}/")
+                            # _BASE_DIR já resolvido no import: zero syscalls no compose
+                            yield Input(id="kb_filepath", placeholder=f"{_BASE_DIR}/")
                             yield Button("➕ Ingerir Arquivo", id="btn-ingest", variant="success")
                         
                         with Horizontal(classes="menu-row"):
@@ -251,175 +209,396 @@ class BotTerminalUI(App):
                         yield Static("⚙️ Configurações Principais", classes="panel-title")
                         yield Button("💾 Salvar Configurações Gerais", id="btn-save-settings", variant="success")
                         yield Label("", id="lbl-save-settings-status", classes="status-label")
-                        
-                        yield Label("Provedor de IA:")
-                        yield Select([("Ollama", "ollama"), ("OpenRouter", "openrouter")], id="cfg_ai_provider")
-                        
-                        yield Label("Token do Telegram:")
-                        yield Input(id="cfg_telegram_token", password=True)
-                        
-                        yield Label("Admin ID (separado por vírgula):")
-                        yield Input(id="cfg_admin_id")
-                        
-                        yield Label("Nível de Logs:")
-                        yield Select([("Baixo", "baixo"), ("Médio", "médio"), ("Alto", "alto")], id="cfg_log_verbosity")
-                        
-                        yield Label("URL do Ollama:")
-                        yield Input(id="cfg_ollama_url")
-                        
-                        yield Label("API Key OpenRouter (Opcional se usar Ollama):")
-                        yield Input(id="cfg_openrouter_key", password=True)
-                        
-                        yield Label("Modelo (IA):")
-                        yield Input(id="cfg_model_name")
-                        
-                        yield Label("Prompt do Sistema:")
-                        yield TextArea(id="cfg_sys_prompt")
-                        
-                        yield Label("Provedor de Embedding:")
-                        yield Select([("Ollama", "ollama"), ("OpenRouter", "openrouter")], id="cfg_embed_provider")
-                        
-                        yield Label("Modelo Embedding:")
-                        yield Input(id="cfg_embed_model")
-                        
-                        yield Label("Temperatura (Ex: 0.7):")
-                        yield Input(id="cfg_temperature")
-                        
-                        yield Label("Máx Tokens:")
-                        yield Input(id="cfg_max_tokens")
-                        
-                        yield Label("Memória de Busca RAG (K):")
-                        yield Input(id="cfg_rag_k")
-                        
-                        yield Label("Histórico de Conversa (0 para desativar):")
-                        yield Input(id="cfg_chat_history")
-                        
-                        yield Label("Limite de Mensagens (Msg/min):")
-                        yield Input(id="cfg_rate_limit")
-                        
-                        yield Label("Diretório ChromaDB (Vazio=Padrão):")
-                        yield Input(id="cfg_chroma_dir")
-                        
-                        yield Label("Mensagem de Boas-vindas:")
-                        yield TextArea(id="cfg_welcome_msg")
+
+                        # Os ~35 widgets de campo são montados sob demanda na
+                        # primeira ativação da aba; ver _build_settings_tab
+                        yield Vertical(id="settings-host")
 
         yield Footer()
 
     def on_mount(self) -> None:
-        """Chamado quando a aplicação é montada. Inicia a leitura do arquivo de log."""
+        """Chamado quando a aplicação é montada; adia o setup pro pós-paint.
+
+        Nada além do call_after_refresh roda aqui: o primeiro frame vai
+        pra tela imediatamente e o trabalho secundário (config, tail,
+        timers, subprocesso da lista RAG) acontece no tick seguinte.
+        """
         self.log_view.write_line("Iniciando monitoramento do log do bot...")
+        self.call_after_refresh(self._post_mount_init)
+
+    async def _post_mount_init(self) -> None:
+        """Setup adiado: roda depois do primeiro frame estar na tela."""
         self.stop_logging = False
-        import threading
-        threading.Thread(target=self.tail_logs, daemon=True).start()
+
+        # Cacheia widgets consultados a cada tick para evitar query_one
+        # repetido. Antes do start_log_tail: o watch de /tmp registrado lá
+        # pode disparar check_external_status/_apply_status a qualquer
+        # momento, e esses callbacks usam os handles abaixo
+        self._lbl_status_main = self.query_one("#lbl-status-main", Label)
+        self._btn_start = self.query_one("#btn-start", Button)
+        self._btn_stop = self.query_one("#btn-stop", Button)
+        self._btn_restart = self.query_one("#btn-restart-svc", Button)
+        self._lbl_save_settings = self.query_one("#lbl-save-settings-status", Label)
+
+        self.start_log_tail()
+
+        # Parse do config.json roda numa thread; a TUI pinta sem esperar o disco
+        self.config_manager = await asyncio.to_thread(ConfigurationManager)
+
+        # Descarrega o buffer de log em lote, no máximo a 30 quadros/s
+        self.set_interval(1 / 30, self._flush_log_buffer)
         
         # Monitora a saúde do bot e verifica se ele está rodando de forma externa (start_rp4.sh / systemd)
-        self.set_interval(2.0, self.check_external_status)
+        # Timer auto-reagendado: 2s logo após uma transição de estado,
+        # recuando para 10s no regime permanente (menos wakeups no Pi)
+        self._last_transition = time.monotonic()
+        self.set_timer(2.0, self._status_tick)
         
-        # Busca IPs em background
+        # Cliente HTTP compartilhado: pool de conexões e sessão TLS reusados
+        import httpx
+        self._http = httpx.AsyncClient(
+            timeout=3.0, limits=httpx.Limits(max_keepalive_connections=4)
+        )
+
+        # Busca IPs em background e re-verifica a cada 5 min (cai no cache
+        # do IP público quando nada mudou)
         asyncio.create_task(self.fetch_network_info())
+        self.set_interval(300.0, self.fetch_network_info)
         
         # Inicia e configura a tabela
         table = self.query_one("#table-kb", DataTable)
         table.add_columns("Arquivo Salvo na Base Vetorial")
         
-        # Carrega configurações na interface do menu e configurações gerais
-        self.load_menu_settings()
-        self.load_general_settings()
-        
+        # Configurações gerais e de menu carregam quando as abas abrem
+
+        # Diretório de destino das ingestões, criado uma vez só
+        os.makedirs(_ARQUIVOS_DIR, exist_ok=True)
+
         # Atualiza a lista da Base
         self.refresh_knowledge_list()
 
-    async def fetch_network_info(self) -> None:
-        """Obtém os IPs assincronamente e atualiza o painel principal."""
+    async def on_tabbed_content_tab_activated(self, event: TabbedContent.TabActivated) -> None:
+        """Monta o conteúdo pesado das abas de menu/configuração na primeira visita."""
+        pane_id = event.pane.id
+        if pane_id in self._built_tabs:
+            return
+        if pane_id == "tab-menu":
+            self._built_tabs.add(pane_id)
+            await self._build_menu_tab()
+        elif pane_id == "tab-settings":
+            self._built_tabs.add(pane_id)
+            await self._build_settings_tab()
+
+    async def _build_settings_tab(self) -> None:
+        """Cria os campos da aba Configuração e carrega os valores salvos."""
+        host = self.query_one("#settings-host", Vertical)
+        await host.mount_all([
+            Label("Provedor de IA:"),
+            Select([("Ollama", "ollama"), ("OpenRouter", "openrouter")], id="cfg_ai_provider"),
+            Label("Token do Telegram:"),
+            Input(id="cfg_telegram_token", password=True),
+            Label("Admin ID (separado por vírgula):"),
+            Input(id="cfg_admin_id"),
+            Label("Nível de Logs:"),
+            Select([("Baixo", "baixo"), ("Médio", "médio"), ("Alto", "alto")], id="cfg_log_verbosity"),
+            Label("URL do Ollama:"),
+            Input(id="cfg_ollama_url"),
+            Label("API Key OpenRouter (Opcional se usar Ollama):"),
+            Input(id="cfg_openrouter_key", password=True),
+            Label("Modelo (IA):"),
+            Input(id="cfg_model_name"),
+            Label("Prompt do Sistema:"),
+            TextArea(id="cfg_sys_prompt"),
+            Label("Provedor de Embedding:"),
+            Select([("Ollama", "ollama"), ("OpenRouter", "openrouter")], id="cfg_embed_provider"),
+            Label("Modelo Embedding:"),
+            Input(id="cfg_embed_model"),
+            Label("Temperatura (Ex: 0.7):"),
+            Input(id="cfg_temperature"),
+            Label("Máx Tokens:"),
+            Input(id="cfg_max_tokens"),
+            Label("Memória de Busca RAG (K):"),
+            Input(id="cfg_rag_k"),
+            Label("Histórico de Conversa (0 para desativar):"),
+            Input(id="cfg_chat_history"),
+            Label("Limite de Mensagens (Msg/min):"),
+            Input(id="cfg_rate_limit"),
+            Label("Diretório ChromaDB (Vazio=Padrão):"),
+            Input(id="cfg_chroma_dir"),
+            Label("Mensagem de Boas-vindas:"),
+            TextArea(id="cfg_welcome_msg"),
+        ])
+        # Widgets indexados por id: um lookup de seletor por widget,
+        # acesso O(1) em load/save_general_settings
+        self._cfg_widgets = {
+            wid: self.query_one(f"#{wid}", cls)
+            for wid, cls in [
+                ("cfg_ai_provider", Select),
+                ("cfg_telegram_token", Input),
+                ("cfg_admin_id", Input),
+                ("cfg_log_verbosity", Select),
+                ("cfg_ollama_url", Input),
+                ("cfg_openrouter_key", Input),
+                ("cfg_model_name", Input),
+                ("cfg_sys_prompt", TextArea),
+                ("cfg_embed_provider", Select),
+                ("cfg_embed_model", Input),
+                ("cfg_temperature", Input),
+                ("cfg_max_tokens", Input),
+                ("cfg_rag_k", Input),
+                ("cfg_chat_history", Input),
+                ("cfg_rate_limit", Input),
+                ("cfg_chroma_dir", Input),
+                ("cfg_welcome_msg", TextArea),
+            ]
+        }
+        self.load_general_settings()
+
+    async def _build_menu_tab(self) -> None:
+        """Cria os 5 grupos de botões do menu e carrega os valores salvos."""
+        host = self.query_one("#menu-host", Vertical)
+        await host.mount_all([MenuButtonGroup(i) for i in range(5)])
+        # Widgets dos 5 slots (20 lookups de seletor feitos uma vez só)
+        self._menu_widgets = [
+            (
+                self.query_one(f"#chk_enabled_{i}", Switch),
+                self.query_one(f"#txt_label_{i}", Input),
+                self.query_one(f"#cmb_action_{i}", Select),
+                self.query_one(f"#txt_param_{i}", TextArea),
+            )
+            for i in range(5)
+        ]
+        self.load_menu_settings()
+
+    @staticmethod
+    def _probe_local_ip() -> str:
+        """Descobre o IP da intranet pela interface da rota default.
+
+        Lê /proc/net/route para achar a interface default e pergunta o
+        endereço dela com um ioctl (SIOCGIFADDR) — sem tocar na tabela de
+        rotas nem no ARP. Fora do Linux (ou sem rota default), recai no
+        truque da rota UDP, que não envia pacotes.
+        """
         import socket
-        import httpx
-        
-        local_ip = "N/A"
         try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            local_ip = s.getsockname()[0]
-            s.close()
-        except:
+            import fcntl
+            import struct
+            iface = None
+            with open("/proc/net/route") as f:
+                next(f)  # cabeçalho
+                for line in f:
+                    fields = line.split()
+                    # Destino 0.0.0.0 com flag RTF_GATEWAY|RTF_UP
+                    if fields[1] == "00000000" and int(fields[3], 16) & 0x2:
+                        iface = fields[0]
+                        break
+            if iface:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                try:
+                    packed = fcntl.ioctl(
+                        sock.fileno(),
+                        0x8915,  # SIOCGIFADDR
+                        struct.pack("256s", iface.encode()[:15]),
+                    )
+                    return socket.inet_ntoa(packed[20:24])
+                finally:
+                    sock.close()
+        except (OSError, ImportError, ValueError, StopIteration):
             pass
-            
-        public_ip = "Verificando..."
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get("https://api.ipify.org", timeout=3.0)
-                if resp.status_code == 200:
-                    public_ip = resp.text.strip()
-                else:
-                    public_ip = "N/A"
-        except:
-            public_ip = "N/A"
-            
-        tailscale_ip = "N/A"
+            sock.connect(("8.8.8.8", 80))
+            return sock.getsockname()[0]
+        finally:
+            sock.close()
+
+    async def _get_local_ip(self) -> str:
+        """IP da intranet, resolvido uma vez por sessão fora do event loop."""
+        if self._cached_local_ip is None:
+            try:
+                # connect()/ioctl bloqueiam; rodam fora do event loop da TUI
+                self._cached_local_ip = await asyncio.to_thread(self._probe_local_ip)
+            except OSError as e:
+                self.log_view.write_line(f"Falha ao obter IP da intranet: {e}")
+                return "N/A"
+        return self._cached_local_ip
+
+    async def _get_public_ip(self) -> str:
+        """IP público via api.ipify.org, com cache de 5 minutos."""
+        import httpx
+
+        if self._cached_public_ip is not None and time.monotonic() - self._public_ip_ts < 300:
+            return self._cached_public_ip
         try:
-            proc = await asyncio.create_subprocess_shell(
-                'tailscale ip -4', 
-                stdout=asyncio.subprocess.PIPE, 
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=2.0)
-            if proc.returncode == 0:
-                tailscale_ip = stdout.decode('utf-8').strip()
-        except:
-            pass
+            resp = await self._http.get("https://api.ipify.org")
+            if resp.status_code != 200:
+                return "N/A"
+            self._cached_public_ip = resp.text.strip()
+            self._public_ip_ts = time.monotonic()
+            return self._cached_public_ip
+        except (httpx.HTTPError, OSError, asyncio.TimeoutError) as e:
+            self.log_view.write_line(f"Falha ao obter IP público: {e}")
+            return "N/A"
+
+    async def _get_tailscale_ip(self) -> str:
+        """IP do Tailscale, resolvido uma vez por sessão."""
+        if self._cached_tailscale_ip is None:
+            try:
+                # exec direto (sem /bin/sh): economiza um fork num Raspberry Pi
+                proc = await asyncio.create_subprocess_exec(
+                    'tailscale', 'ip', '-4',
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL
+                )
+                stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=2.0)
+                if proc.returncode == 0:
+                    self._cached_tailscale_ip = stdout.decode('utf-8').strip()
+            except (OSError, asyncio.TimeoutError):
+                # tailscale ausente/parado é esperado em várias instalações
+                pass
+        return self._cached_tailscale_ip or "N/A"
 
+    async def fetch_network_info(self) -> None:
+        """Obtém os três IPs em paralelo e atualiza o painel principal.
+
+        gather() sobrepõe as latências: o tempo total vira o máximo das
+        três sondas em vez da soma.
+        """
+        local_ip, public_ip, tailscale_ip = await asyncio.gather(
+            self._get_local_ip(),
+            self._get_public_ip(),
+            self._get_tailscale_ip(),
+        )
         info_text = (
             f"🌐 IP Intranet: {local_ip}\n"
             f"🌍 IP Internet: {public_ip}\n"
             f"🔒 Tailscale: {tailscale_ip}\n"
         )
+        self.query_one("#lbl-network-info", Static).update(info_text)
+
+    def _read_lock_pid(self) -> int:
+        """Lê o PID do lock com um guard de mtime: 1 stat por tick.
+
+        No caminho comum (lock inalterado) devolve o PID cacheado sem
+        abrir o arquivo; open+read+parse só quando o mtime muda. Reabrir
+        a cada mudança também cobre o start_rp4.sh recriando o lock com
+        outro inode. Retorna -1 sem lock/PID válido.
+        """
+        lock_file = "/tmp/telegram-bot.pid"
         try:
-            self.query_one("#lbl-network-info", Static).update(info_text)
-        except:
-            pass
+            mtime = os.stat(lock_file).st_mtime_ns
+        except OSError:
+            self._pid_cache = (0, -1)
+            return -1
+        if mtime == self._pid_cache[0]:
+            return self._pid_cache[1]
+        try:
+            fd = os.open(lock_file, os.O_RDONLY | os.O_NONBLOCK)
+            try:
+                pid = int(os.pread(fd, 16, 0).strip())
+            finally:
+                os.close(fd)
+        except (OSError, ValueError):
+            pid = -1
+        self._pid_cache = (mtime, pid)
+        return pid
+
+    def _status_tick(self) -> None:
+        """Roda a checagem de status e reagenda com backoff adaptativo."""
+        self.check_external_status()
+        delay = 2.0 if time.monotonic() - self._last_transition < 30.0 else 10.0
+        self.set_timer(delay, self._status_tick)
 
     def check_external_status(self) -> None:
         """Verifica se há um lock PID externo criado pelo script start_rp4.sh e ajusta a interface."""
-        lock_file = "/tmp/telegram-bot.pid"
         is_running_externally = False
-        
-        if os.path.exists(lock_file):
+
+        pid = self._read_lock_pid()
+        if pid > 0 and pid == self._pidfd_pid:
+            # pidfd ativo: o kernel garante o aviso de saída, dispensa o kill(0)
+            is_running_externally = True
+        elif pid > 0:
             try:
-                with open(lock_file, "r") as f:
-                    pid = int(f.read().strip())
                 # Checa se o processo existe no Unix (sinal 0 não mata, apenas checa permissão/presença)
-                import signal
                 os.kill(pid, 0)
                 is_running_externally = True
-            except (ValueError, OSError):
+                self._watch_external_pid(pid)
+            except PermissionError:
+                # PID vivo mas de outro usuário: conta como rodando
+                is_running_externally = True
+            except OSError:
                 pass
                 
         # Se estiver rodando no TUI (internal), o sistema flui normalmente
         is_running_internally = self.bot_task and not self.bot_task.done()
 
-        if is_running_externally:
-            self.query_one("#lbl-status", Label).update("Status: [yellow]RODANDO EM BACKGROUND (start_rp4)[/yellow]")
-            self.query_one("#lbl-status-main", Label).update("Status: [yellow]RODANDO EM BACKGROUND (start_rp4)[/yellow]")
-            self.query_one("#btn-start", Button).disabled = True
+        new_status = "external" if is_running_externally else "internal" if is_running_internally else "stopped"
+        if new_status == self._last_status:
+            return
+        self._last_status = new_status
+        self._last_transition = time.monotonic()
+        self._apply_status(new_status)
+
+    def _apply_status(self, status: str) -> None:
+        """Aplica um estado ('external'/'internal'/'stopped') nos widgets."""
+        if status == "external":
+            self._lbl_status_main.update(self.STATUS_EXTERNAL)
+            self._btn_start.disabled = True
             # Parar não funciona pelo TUI para kills externos a menos que usemos os.kill na thread principal. Melhor evitar para não quebrar a lógica do watchdog
-            self.query_one("#btn-stop", Button).disabled = True
-            self.query_one("#btn-stop", Button).tooltip = "O bot está sendo gerenciado pelo systemd / start_rp4.sh"
-            self.query_one("#btn-restart-svc", Button).disabled = False
-            
-        elif is_running_internally:
-            self.query_one("#lbl-status", Label).update("Status: [green]RODANDO[/green]")
-            self.query_one("#lbl-status-main", Label).update("Status: [green]RODANDO[/green]")
-            self.query_one("#btn-start", Button).disabled = True
-            self.query_one("#btn-stop", Button).disabled = False
-            self.query_one("#btn-stop", Button).tooltip = ""
-            self.query_one("#btn-restart-svc", Button).disabled = True
-            
+            self._btn_stop.disabled = True
+            self._btn_stop.tooltip = "O bot está sendo gerenciado pelo systemd / start_rp4.sh"
+            self._btn_restart.disabled = False
+
+        elif status == "internal":
+            self._lbl_status_main.update(self.STATUS_RUNNING)
+            self._btn_start.disabled = True
+            self._btn_stop.disabled = False
+            self._btn_stop.tooltip = ""
+            self._btn_restart.disabled = True
+
         else:
-            self.query_one("#lbl-status", Label).update("Status: [red]PARADO[/red]")
-            self.query_one("#lbl-status-main", Label).update("Status: [red]PARADO[/red]")
-            self.query_one("#btn-start", Button).disabled = False
-            self.query_one("#btn-stop", Button).disabled = True
-            self.query_one("#btn-stop", Button).tooltip = ""
-            self.query_one("#btn-restart-svc", Button).disabled = True
+            self._lbl_status_main.update(self.STATUS_STOPPED)
+            self._btn_start.disabled = False
+            self._btn_stop.disabled = True
+            self._btn_stop.tooltip = ""
+            self._btn_restart.disabled = True
+
+    def _watch_external_pid(self, pid: int) -> None:
+        """Registra um pidfd para ser avisado imediatamente quando o bot externo morrer.
+
+        Em kernels sem pidfd_open (<5.3), o polling de 2s continua cobrindo o caso.
+        """
+        if self._pidfd is not None and self._pidfd_pid == pid:
+            return
+        self._unwatch_external_pid()
+        try:
+            fd = os.pidfd_open(pid)
+        except (AttributeError, OSError):
+            return
+        try:
+            asyncio.get_running_loop().add_reader(fd, self._on_external_pid_exit)
+        except RuntimeError:
+            os.close(fd)
+            return
+        self._pidfd = fd
+        self._pidfd_pid = pid
+
+    def _unwatch_external_pid(self) -> None:
+        if self._pidfd is None:
+            return
+        try:
+            asyncio.get_running_loop().remove_reader(self._pidfd)
+        except RuntimeError:
+            pass
+        os.close(self._pidfd)
+        self._pidfd = None
+        self._pidfd_pid = None
+
+    def _on_external_pid_exit(self) -> None:
+        """Callback do pidfd: o processo externo terminou, atualiza a UI já."""
+        self._unwatch_external_pid()
+        self.check_external_status()
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Trata cliques nos botões."""
@@ -466,27 +645,56 @@ class BotTerminalUI(App):
             "ollama_url": self.config_manager.get("ollama_url", "http://127.0.0.1:11434")
         }
 
+    async def _worker_request(self, worker_data: dict) -> dict:
+        """Envia um request pro ingest_worker persistente e espera a resposta.
+
+        O worker é um único subprocesso em modo --server (JSON por linha),
+        então o custo de subir o interpretador e importar chroma/langchain
+        é pago uma vez, não a cada clique. O lock serializa os requests.
+        """
+        import json
+        async with self._worker_lock:
+            if self._worker_proc is None or self._worker_proc.returncode is not None:
+                self._worker_proc = await asyncio.create_subprocess_exec(
+                    sys.executable, _WORKER_SCRIPT, "--server",
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    cwd=_BASE_DIR
+                )
+                asyncio.create_task(self._pump_worker_stderr(self._worker_proc))
+            self._worker_proc.stdin.write(json.dumps(worker_data).encode('utf-8') + b"\n")
+            await self._worker_proc.stdin.drain()
+            line = await self._worker_proc.stdout.readline()
+            if worker_data.get("action") == "clear" and line:
+                # O worker encerra sozinho após um "clear" (para soltar os
+                # handles do chroma); colhe o processo ainda sob o lock para
+                # o próximo request respawnar em vez de escrever num pipe
+                # morto (returncode só muda depois do wait)
+                await self._worker_proc.wait()
+                self._worker_proc = None
+        if not line:
+            raise RuntimeError("O worker de ingestão encerrou inesperadamente.")
+        return json.loads(line)
+
+    async def _pump_worker_stderr(self, proc) -> None:
+        """Ecoa o progresso do worker (stderr) no painel de log em tempo real.
+
+        Linha a linha, memória O(linha): o usuário vê o andamento de uma
+        ingestão longa em vez de esperar o job terminar em silêncio.
+        """
+        try:
+            async for raw in proc.stderr:
+                line = raw.decode("utf-8", errors="replace").rstrip()
+                if line:
+                    self._log_buffer.append(f"[worker] {line}\n")
+        except Exception:
+            pass
+
     async def run_worker_task(self, worker_data: dict, success_msg: str) -> None:
         """Executa um comando no ingest_worker de forma assíncrona."""
-        import json
-        worker_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ingest_worker.py")
-        
         try:
-            proc = await asyncio.create_subprocess_exec(
-                sys.executable, worker_script,
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=os.path.dirname(os.path.abspath(__file__))
-            )
-            stdout, stderr = await proc.communicate(input=json.dumps(worker_data).encode('utf-8'))
-            
-            if proc.returncode != 0:
-                self.log_view.write_line(f">>> Erro no worker: {stderr.decode('utf-8')}")
-                return None
-                
-            last_line = stdout.decode('utf-8').strip().split('\n')[-1]
-            data = json.loads(last_line)
+            data = await self._worker_request(worker_data)
             if not data.get("ok"):
                 self.log_view.write_line(f">>> Ocorreu um erro na ação: {data.get('error')}")
                 return None
@@ -500,22 +708,43 @@ class BotTerminalUI(App):
             self.log_view.write_line(f">>> Erro interno de execução: {e}")
             return None
 
+    @staticmethod
+    def _copy_into_arquivos(src: str, dst: str) -> None:
+        """Copia preservando o mtime, com copy_file_range quando disponível.
+
+        No Linux >= 4.5 a cópia acontece dentro do kernel (page cache),
+        sem atravessar o userspace; em outras plataformas cai no copy2.
+        """
+        import shutil
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            st = os.stat(src)
+            os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+        except (AttributeError, OSError):
+            shutil.copy2(src, dst)
+
     def ingest_file(self) -> None:
         filepath = self.query_one("#kb_filepath", Input).value.strip()
-        if not filepath or not os.path.exists(filepath):
+        if not filepath:
             self.log_view.write_line(">>> Erro: Arquivo especificado não encontrado.")
             return
-            
-        import shutil
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        arquivos_path = os.path.join(base_dir, "arquivos")
-        os.makedirs(arquivos_path, exist_ok=True)
+
         filename = os.path.basename(filepath)
-        target_fname = os.path.join(arquivos_path, filename)
-        
+        target_fname = os.path.join(_ARQUIVOS_DIR, filename)
+
         if os.path.abspath(filepath) != os.path.abspath(target_fname):
             try:
-                shutil.copy2(filepath, target_fname)
+                self._copy_into_arquivos(filepath, target_fname)
+            except FileNotFoundError:
+                # O open falhando substitui o stat prévio de existência
+                self.log_view.write_line(">>> Erro: Arquivo especificado não encontrado.")
+                return
             except Exception as e:
                 self.log_view.write_line(f">>> Erro ao copiar arquivo: {e}")
                 return
@@ -553,141 +782,112 @@ class BotTerminalUI(App):
         async def fetch_list():
             data = self.get_worker_base_data()
             data["action"] = "list"
-            import json
-            worker_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ingest_worker.py")
-            
             try:
-                proc = await asyncio.create_subprocess_exec(
-                    sys.executable, worker_script,
-                    stdin=asyncio.subprocess.PIPE,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                    cwd=os.path.dirname(os.path.abspath(__file__))
-                )
-                stdout, _ = await proc.communicate(input=json.dumps(data).encode('utf-8'))
-                if proc.returncode == 0:
-                    last_line = stdout.decode('utf-8').strip().split('\n')[-1]
-                    res = json.loads(last_line)
-                    if res.get("ok"):
-                        files = res.get("result", [])
-                        table = self.query_one("#table-kb", DataTable)
-                        table.clear()
-                        for f in files: table.add_row(f)
-                        self.query_one("#btn-delete-file", Button).disabled = True
-                        
+                res = await self._worker_request(data)
+                if res.get("ok"):
+                    # Diff contra o estado anterior: só as linhas que mudaram
+                    # são adicionadas/removidas, em vez de reconstruir a tabela
+                    new_files = set(res.get("result", []))
+                    if new_files == set(self._kb_rows):
+                        return
+                    table = self.query_one("#table-kb", DataTable)
+                    for name in sorted(new_files - set(self._kb_rows)):
+                        self._kb_rows[name] = table.add_row(name)
+                    for name in set(self._kb_rows) - new_files:
+                        table.remove_row(self._kb_rows.pop(name))
+                    self.query_one("#btn-delete-file", Button).disabled = True
+
             except Exception as e:
                 self.log_view.write_line(f">>> Erro listando a base: {e}")
-        
+
         asyncio.create_task(fetch_list())
 
     def clear_history_action(self) -> None:
         self.log_view.write_line(">>> Apagando Histórico de Logs Analítico...")
+        asyncio.create_task(self._clear_history())
+
+    async def _clear_history(self) -> None:
+        """Zera o histórico no SQLite fora do event loop (pool do to_thread)."""
         from analytics_manager import AnalyticsManager
-        import threading
-        
-        def run_clear():
-            mgr = AnalyticsManager()
-            if mgr.clear_history():
-                 self.call_from_thread(self.log_view.write_line, ">>> Histórico de conversas apagado com sucesso do SQLite!")
-            else:
-                 self.call_from_thread(self.log_view.write_line, ">>> Falha ao zerar histórico.")
-        
-        threading.Thread(target=run_clear, daemon=True).start()
+        mgr = AnalyticsManager()
+        if await asyncio.to_thread(mgr.clear_history):
+            self.log_view.write_line(">>> Histórico de conversas apagado com sucesso do SQLite!")
+        else:
+            self.log_view.write_line(">>> Falha ao zerar histórico.")
+
+    @staticmethod
+    def _safe_cast(cast, value, default):
+        """Converte um valor de widget, caindo pro default em entrada inválida."""
+        try:
+            return cast(value)
+        except (TypeError, ValueError):
+            return default
 
     def load_general_settings(self) -> None:
         """Carrega os dados de configuração gerais do config.json para os widgets da Aba Configuração."""
         d = self.config_manager.config_data
         try:
+            # Campos simples: uma passada pela tabela
+            for key, wid, attr, _cast, default in self.GENERAL_FIELDS:
+                setattr(self._cfg_widgets[wid], attr, str(d.get(key, default)))
+
+            # Campos condicionais (Selects validados e modelo por provedor)
             prov = d.get("ai_provider", "ollama")
             if prov not in ["ollama", "openrouter"]: prov = "ollama"
-            self.query_one("#cfg_ai_provider", Select).value = prov
-            
-            self.query_one("#cfg_telegram_token", Input).value = d.get("telegram_token", "")
-            self.query_one("#cfg_admin_id", Input).value = str(d.get("admin_id", ""))
-            
+            self._cfg_widgets["cfg_ai_provider"].value = prov
+
             verb = d.get("log_verbosity", "médio")
             if verb not in ["baixo", "médio", "alto"]: verb = "médio"
-            self.query_one("#cfg_log_verbosity", Select).value = verb
-            
-            self.query_one("#cfg_ollama_url", Input).value = d.get("ollama_url", "http://127.0.0.1:11434")
-            self.query_one("#cfg_openrouter_key", Input).value = d.get("openrouter_key", "")
-            
+            self._cfg_widgets["cfg_log_verbosity"].value = verb
+
             if prov == "ollama":
                 model = d.get("ollama_model", "llama3:latest")
             else:
                 model = d.get("openrouter_model", "openai/gpt-3.5-turbo")
-            self.query_one("#cfg_model_name", Input).value = model
-            
-            self.query_one("#cfg_sys_prompt", TextArea).text = d.get("system_prompt", "")
-            
+            self._cfg_widgets["cfg_model_name"].value = model
+
             e_prov = d.get("embedding_provider", "ollama")
             if e_prov not in ["ollama", "openrouter"]: e_prov = "ollama"
-            self.query_one("#cfg_embed_provider", Select).value = e_prov
-            
+            self._cfg_widgets["cfg_embed_provider"].value = e_prov
+
             if e_prov == "openrouter":
                 e_model = d.get("openrouter_embedding_model", "openai/text-embedding-3-small")
             else:
                 e_model = d.get("ollama_embedding_model", "qwen3-embedding:latest")
-            self.query_one("#cfg_embed_model", Input).value = e_model
-            
-            self.query_one("#cfg_temperature", Input).value = str(d.get("temperature", 0.7))
-            self.query_one("#cfg_max_tokens", Input).value = str(d.get("max_tokens", 2048))
-            self.query_one("#cfg_rag_k", Input).value = str(d.get("rag_k", 8))
-            self.query_one("#cfg_chat_history", Input).value = str(d.get("chat_history_size", 5))
-            self.query_one("#cfg_rate_limit", Input).value = str(d.get("rate_limit_per_minute", 10))
-            self.query_one("#cfg_chroma_dir", Input).value = d.get("chroma_dir", "")
-            self.query_one("#cfg_welcome_msg", TextArea).text = d.get("welcome_message", "")
+            self._cfg_widgets["cfg_embed_model"].value = e_model
         except Exception as e:
             self.log_view.write_line(f">>> Erro ao carregar configurações gerais na aba: {e}")
 
     def save_general_settings(self) -> None:
         """Salva a configuração da aba de Configuração pro config_manager."""
-        updates = {}
         try:
-            prov = self.query_one("#cfg_ai_provider", Select).value or "ollama"
+            # Campos simples: mesma tabela do load, com cast seguro
+            updates = {
+                key: self._safe_cast(cast, getattr(self._cfg_widgets[wid], attr), default)
+                for key, wid, attr, cast, default in self.GENERAL_FIELDS
+            }
+
+            prov = self._cfg_widgets["cfg_ai_provider"].value or "ollama"
             updates["ai_provider"] = prov
-            updates["telegram_token"] = self.query_one("#cfg_telegram_token", Input).value
-            updates["admin_id"] = self.query_one("#cfg_admin_id", Input).value
-            updates["log_verbosity"] = self.query_one("#cfg_log_verbosity", Select).value or "médio"
-            updates["ollama_url"] = self.query_one("#cfg_ollama_url", Input).value
-            updates["openrouter_key"] = self.query_one("#cfg_openrouter_key", Input).value
-            
-            model = self.query_one("#cfg_model_name", Input).value
+            updates["log_verbosity"] = self._cfg_widgets["cfg_log_verbosity"].value or "médio"
+
+            model = self._cfg_widgets["cfg_model_name"].value
             if prov == "ollama":
                 updates["ollama_model"] = model
             else:
                 updates["openrouter_model"] = model
-                
-            updates["system_prompt"] = self.query_one("#cfg_sys_prompt", TextArea).text
-            
-            e_prov = self.query_one("#cfg_embed_provider", Select).value or "ollama"
+
+            e_prov = self._cfg_widgets["cfg_embed_provider"].value or "ollama"
             updates["embedding_provider"] = e_prov
-            e_model = self.query_one("#cfg_embed_model", Input).value
+            e_model = self._cfg_widgets["cfg_embed_model"].value
             if e_prov == "openrouter":
                 updates["openrouter_embedding_model"] = e_model
             else:
                 updates["ollama_embedding_model"] = e_model
-                
-            # Safely cast numeric fields
-            def float_val(val, default):
-                try: return float(val)
-                except: return default
-            def int_val(val, default):
-                try: return int(val)
-                except: return default
-
-            updates["temperature"] = float_val(self.query_one("#cfg_temperature", Input).value, 0.7)
-            updates["max_tokens"] = int_val(self.query_one("#cfg_max_tokens", Input).value, 2048)
-            updates["rag_k"] = int_val(self.query_one("#cfg_rag_k", Input).value, 8)
-            updates["chat_history_size"] = int_val(self.query_one("#cfg_chat_history", Input).value, 5)
-            updates["rate_limit_per_minute"] = int_val(self.query_one("#cfg_rate_limit", Input).value, 10)
-            
-            updates["chroma_dir"] = self.query_one("#cfg_chroma_dir", Input).value
-            updates["welcome_message"] = self.query_one("#cfg_welcome_msg", TextArea).text
-            
+
             self.config_manager.update_batch(updates)
             
-            lbl = self.query_one("#lbl-save-settings-status", Label)
+            lbl = self._lbl_save_settings
             lbl.update("[green]Configurações principais persistidas no sistema![/green]")
             self.set_timer(3.0, lambda: lbl.update(""))
             self.log_view.write_line(">>> Configurações gerais salvas no arquivo config.json.")
@@ -696,14 +896,12 @@ class BotTerminalUI(App):
 
     def load_menu_settings(self) -> None:
         """Carrega os botões salvos na TUI."""
-        buttons = self.config_manager.get("menu_buttons", [])
-        for i in range(5):
-            try:
-                chk = self.query_one(f"#chk_enabled_{i}", Switch)
-                txt_label = self.query_one(f"#txt_label_{i}", Input)
-                cmb = self.query_one(f"#cmb_action_{i}", Select)
-                txt_param = self.query_one(f"#txt_param_{i}", TextArea)
-                
+        # Os widgets já foram validados ao montar o cache; um único guard
+        # externo cobre o caso raro de árvore incompleta, sem pagar
+        # try/except por iteração no caminho comum
+        try:
+            buttons = self.config_manager.get("menu_buttons", [])
+            for i, (chk, txt_label, cmb, txt_param) in enumerate(self._menu_widgets):
                 if i < len(buttons):
                     btn = buttons[i]
                     chk.value = btn.get("enabled", True)
@@ -715,30 +913,34 @@ class BotTerminalUI(App):
                     txt_label.value = ""
                     cmb.value = "fixed_text"
                     txt_param.text = ""
-            except Exception as e:
-                self.log_view.write_line(f">>> Erro interno ao carregar layout do botão {i}: {e}")
+        except Exception as e:
+            self.log_view.write_line(f">>> Erro interno ao carregar layout dos botões: {e}")
 
     def save_menu_settings(self) -> None:
         """Salva a configuração do menu persistindo no config.json."""
-        menu_btns = []
-        for i in range(5):
-            try:
-                chk = self.query_one(f"#chk_enabled_{i}", Switch).value
-                txt_label = self.query_one(f"#txt_label_{i}", Input).value
-                cmb = self.query_one(f"#cmb_action_{i}", Select).value
-                txt_param = self.query_one(f"#txt_param_{i}", TextArea).text
-                
-                menu_btns.append({
+        if self.config_manager is None:
+            return
+        try:
+            menu_btns = [
+                {
                     "id": f"btn{i+1}",
-                    "enabled": chk,
-                    "text": txt_label,
-                    "action": cmb or "fixed_text",
-                    "parameter": txt_param
-                })
-            except Exception as e:
-                self.log_view.write_line(f">>> Erro interno (leitura) botão {i}: {e}")
-            
-        self.config_manager.update_batch({"menu_buttons": menu_btns})
+                    "enabled": chk.value,
+                    "text": txt_label.value,
+                    "action": cmb.value or "fixed_text",
+                    "parameter": txt_param.text
+                }
+                for i, (chk, txt_label, cmb, txt_param) in enumerate(self._menu_widgets)
+            ]
+        except Exception as e:
+            self.log_view.write_line(f">>> Erro interno (leitura) dos botões: {e}")
+            return
+
+
+        # Debounce: salva só o último estado, fora do event loop da TUI
+        if self._save_task is not None and not self._save_task.done():
+            self._save_task.cancel()
+        self._save_task = asyncio.create_task(self._do_save_menu(menu_btns))
+
         try:
             lbl = self.query_one("#lbl-save-status", Label)
             lbl.update("[green]Configuração salva dinamicamente no sistema![/green]")
@@ -746,6 +948,15 @@ class BotTerminalUI(App):
         except: pass
         self.log_view.write_line(">>> Configurações de menu salvas no arquivo config.json.")
 
+    async def _do_save_menu(self, menu_btns: list) -> None:
+        """Grava o config.json em background após uma janela de 300ms.
+
+        Saves em sequência rápida cancelam o anterior, então N cliques
+        geram uma única reescrita do arquivo.
+        """
+        await asyncio.sleep(0.3)
+        await asyncio.to_thread(self.config_manager.update_batch, {"menu_buttons": menu_btns})
+
     def start_bot(self) -> None:
         """Inicia a execução do bot Telegram assincronamente."""
         if self.bot_task and not self.bot_task.done():
@@ -757,15 +968,18 @@ class BotTerminalUI(App):
              self.log_view.write_line("Falha ao iniciar: Detectado PID lock file. Bot está sendo gerenciado em background.")
              return
 
-        self.query_one("#lbl-status", Label).update("Status: [green]RODANDO[/green]")
-        self.query_one("#btn-start", Button).disabled = True
-        self.query_one("#btn-stop", Button).disabled = False
+        self._last_status = "internal"
+        self._lbl_status_main.update(self.STATUS_RUNNING)
+        self._btn_start.disabled = True
+        self._btn_stop.disabled = False
         
         self.telegram_controller = TelegramBotController()
         
         # Como o Textual internamente roda um self.loop (Event loop do asyncio),
         # podemos apenas criar uma task com a coroutine start() do bot.
         self.bot_task = asyncio.create_task(self.telegram_controller.start())
+        # Transição interna (crash/termino) reflete na UI sem esperar o timer
+        self.bot_task.add_done_callback(lambda _t: self.check_external_status())
         self.log_view.write_line(">>> Comando de inicialização do Bot enviado.")
 
     def stop_bot(self) -> None:
@@ -779,72 +993,260 @@ class BotTerminalUI(App):
             # Chama a parada do controller de maneira assíncrona
             asyncio.create_task(self.telegram_controller.stop())
             
-        self.query_one("#lbl-status", Label).update("Status: [red]PARADO[/red]")
-        try:
-            self.query_one("#lbl-status-main", Label).update("Status: [red]PARADO[/red]")
-        except:
-            pass
-        self.query_one("#btn-start", Button).disabled = False
-        self.query_one("#btn-stop", Button).disabled = True
+        self._last_status = "stopped"
+        self._lbl_status_main.update(self.STATUS_STOPPED)
+        self._btn_start.disabled = False
+        self._btn_stop.disabled = True
 
     def restart_service(self) -> None:
         """Reinicia o serviço matando o processo filho, o que ativa o Watchdog silencioso do script."""
         self.log_view.write_line(">>> Enviando sinal de reinício para o processo em background...")
+        # exclusive=True: cliques repetidos no botão não empilham restarts
+        self.run_worker(self._do_restart(), exclusive=True, group="restart")
+
+    async def _do_restart(self) -> None:
+        """Mata o processo em background; o Watchdog do start_rp4.sh religa o bot."""
         try:
-            async def run_restart():
-                # Evita o "sudo systemctl" que pede senha nativamente arruinando a TUI.
-                # Como o start_rp4.sh possui um Watchdog (restart count e sleep), 
-                # ao fechar a instância Python, ele aciona o reboot automaticamente.
-                proc = await asyncio.create_subprocess_shell(
-                    'pkill -f "python3 main.py --cli" || pkill -f "python main.py --cli"',
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
+            # Evita o "sudo systemctl" que pede senha nativamente arruinando a TUI.
+            # Como o start_rp4.sh possui um Watchdog (restart count e sleep),
+            # ao fechar a instância Python, ele aciona o reboot automaticamente.
+            pid = self._read_lock_pid()
+            if pid <= 0:
+                self.log_view.write_line(">>> PID lock não encontrado; nada para reiniciar.")
+                return
+            import signal
+            try:
+                # pidfd: imune a reuso de PID entre a leitura do lock e o sinal
+                fd = os.pidfd_open(pid)
+                try:
+                    os.pidfd_send_signal(fd, signal.SIGTERM)
+                finally:
+                    os.close(fd)
+            except (AttributeError, OSError):
+                os.kill(pid, signal.SIGTERM)
+            self.log_view.write_line(">>> Processo finalizado com sucesso. O Watchdog ligará o bot novamente em até 15 segundos...")
+        except ProcessLookupError:
+            self.log_view.write_line(">>> Processo do lock já não existe.")
+        except Exception as e:
+            self.log_view.write_line(f">>> Erro interno ao chamar restart: {e}")
+
+    def start_log_tail(self) -> None:
+        """Inicia o tail do bot.log (como 'tail -f') sem travar a interface.
+
+        Com inotify o fd é registrado direto no event loop (sem thread e sem
+        call_from_thread); sem inotify, recai numa thread de polling.
+        """
+        # Garante que o arquivo existe (O_CREAT é idempotente; dispensa o stat prévio)
+        os.close(os.open(self.log_file_path, os.O_CREAT | os.O_WRONLY, 0o644))
+
+        self._log_fd = os.open(self.log_file_path, os.O_RDONLY)
+        self._log_ino = os.fstat(self._log_fd).st_ino
+        # Pula para o final
+        os.lseek(self._log_fd, 0, os.SEEK_END)
+
+        if INotify is not None:
+            self._inotify = INotify()
+            self._log_wd = self._inotify.add_watch(
+                self.log_file_path, inotify_flags.MODIFY | inotify_flags.CREATE
+            )
+            # O watch acima fica preso ao inode atual: após o logrotate
+            # renomear/recriar o arquivo, só o watch do diretório pai vê
+            # o bot.log novo aparecer
+            try:
+                self._log_dir_wd = self._inotify.add_watch(
+                    os.path.dirname(self.log_file_path) or ".",
+                    inotify_flags.CREATE | inotify_flags.MOVED_TO
                 )
-                await proc.communicate()
-                self.log_view.write_line(">>> Processo finalizado com sucesso. O Watchdog ligará o bot novamente em até 15 segundos...")
-            
-            asyncio.create_task(run_restart())
+            except OSError:
+                self._log_dir_wd = None
+            # Observa também o lock do bot externo: o status muda por evento,
+            # sem depender só do timer de polling
+            try:
+                self._tmp_wd = self._inotify.add_watch(
+                    "/tmp", inotify_flags.CREATE | inotify_flags.DELETE | inotify_flags.MOVED_TO
+                )
+            except OSError:
+                self._tmp_wd = None
+            asyncio.get_running_loop().add_reader(self._inotify.fileno(), self._drain_log)
+        else:
+            # Worker do Textual: cancelado junto com o app no shutdown
+            self._tail_task = self.run_worker(
+                self._tail_logs_async(), exclusive=True, group="log-tail"
+            )
+
+    def _drain_log(self) -> None:
+        """Callback do event loop quando o fd do inotify fica legível."""
+        try:
+            saw_log = saw_lock = False
+            log_name = os.path.basename(self.log_file_path)
+            for event in self._inotify.read(timeout=0):
+                if event.wd == self._log_wd:
+                    saw_log = True
+                elif self._log_dir_wd is not None and event.wd == self._log_dir_wd \
+                        and event.name == log_name:
+                    # bot.log recriado pelo logrotate: o watch antigo morreu
+                    # junto com o inode renomeado; reabre e segue no novo
+                    self._reopen_log_if_rotated()
+                    saw_log = True
+                elif event.name == "telegram-bot.pid":
+                    saw_lock = True
+            if saw_log:
+                self._emit_new_log_lines()
+            if saw_lock:
+                self.check_external_status()
         except Exception as e:
-             self.log_view.write_line(f">>> Erro interno ao chamar restart: {e}")
+            self._log_buffer.append(f"Erro ao ler logs: {e}\n")
 
-    def tail_logs(self):
-        """Lê o arquivo de log do bot num loop independente (como 'tail -f') sem travar a interface."""
-        log_file = self.log_file_path
-        
-        # Se o arquivo não existe, cria para evitar erros de leitura iniciais
-        if not os.path.exists(log_file):
-            open(log_file, 'a').close()
-            
+    def stop_log_tail(self) -> None:
+        """Desregistra o inotify do loop e fecha os descritores do tail."""
+        self.stop_logging = True
+        if self._tail_task is not None:
+            self.workers.cancel_group(self, "log-tail")
+            self._tail_task = None
+        if self._inotify is not None:
+            try:
+                asyncio.get_running_loop().remove_reader(self._inotify.fileno())
+            except RuntimeError:
+                pass
+            self._inotify.close()
+            self._inotify = None
+        if self._log_fd is not None:
+            os.close(self._log_fd)
+            self._log_fd = None
+
+    def _emit_new_log_lines(self) -> bool:
+        """Lê o delta disponível em blocos de 64 KiB e enfileira as linhas.
+
+        Um read(2) por bloco em vez de um readline() por linha; a linha
+        parcial ao final fica no buffer até o próximo wake. Se o inode do
+        arquivo mudou (logrotate), reabre e segue do início do novo arquivo.
+        """
+        got_data = False
+        while True:
+            raw = os.read(self._log_fd, 65536)
+            if not raw:
+                break
+            got_data = True
+            self._log_tail_buf += raw
+
+        if not got_data:
+            self._reopen_log_if_rotated()
+            return False
+
+        idx = self._log_tail_buf.rfind(b"\n")
+        if idx < 0:
+            return True
+        chunk = self._log_tail_buf[:idx + 1].decode("utf-8", errors="replace")
+        del self._log_tail_buf[:idx + 1]
+        self._log_buffer.append(chunk)
+        # Rajadas longas não esperam o próximo frame de 33ms
+        if len(self._log_buffer) >= 64:
+            self._flush_log_buffer()
+        return True
+
+    def _reopen_log_if_rotated(self) -> None:
+        """Reabre o bot.log quando o logrotate trocou o arquivo por baixo.
+
+        Cobre também rotação copytruncate: o inode não muda, mas o arquivo
+        fica menor que o offset de leitura — basta voltar ao início.
+        """
         try:
-            import time
-            with open(log_file, "r", encoding="utf-8") as f:
-                # Pula para o final
-                f.seek(0, 2)
-                
-                while not getattr(self, "stop_logging", False):
-                    where = f.tell()
-                    line = f.readline()
-                    
-                    if not line:
-                        time.sleep(0.5)
-                        f.seek(where) # Reset pointer since readline might have advanced without full line
-                        continue
-                        
-                    # Agenda de forma segura para o EventLoop da Tela principal renderizar
-                    self.call_from_thread(self.log_view.write_line, line.strip())
+            st = os.stat(self.log_file_path)
+        except FileNotFoundError:
+            return
+        if st.st_ino == self._log_ino:
+            if st.st_size < os.lseek(self._log_fd, 0, os.SEEK_CUR):
+                os.lseek(self._log_fd, 0, os.SEEK_SET)
+                self._log_tail_buf.clear()
+            return
+        os.close(self._log_fd)
+        self._log_fd = os.open(self.log_file_path, os.O_RDONLY)
+        self._log_ino = os.fstat(self._log_fd).st_ino
+        # Linha parcial do arquivo antigo não pertence ao novo
+        self._log_tail_buf.clear()
+        if self._inotify is not None:
+            self._log_wd = self._inotify.add_watch(
+                self.log_file_path, inotify_flags.MODIFY | inotify_flags.CREATE
+            )
+
+    def _flush_log_buffer(self) -> None:
+        """Escreve todo o texto pendente de uma vez (1 render por lote).
+
+        O widget Log é de texto puro (sem markup), então o chunk multilinha
+        inteiro vai num único write() e o Textual quebra as linhas uma vez
+        só, em vez de tokenizar linha a linha.
+        """
+        if not self._log_buffer:
+            return
+        batch = "".join(self._log_buffer)
+        self._log_buffer.clear()
+        self.log_view.write(batch)
+
+    async def _tail_logs_async(self) -> None:
+        """Fallback sem inotify: corrotina que varre o arquivo a cada 500ms.
+
+        Roda no próprio event loop da TUI (sem thread e sem lock); o
+        shutdown a encerra via cancel() em vez de esperar o sleep.
+        """
+        try:
+            while not self._shutdown.is_set():
+                if not self._emit_new_log_lines():
+                    # Acorda no sinal de shutdown ou após 500ms, o que vier antes
+                    try:
+                        await asyncio.wait_for(self._shutdown.wait(), timeout=0.5)
+                    except asyncio.TimeoutError:
+                        pass
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            self.call_from_thread(self.log_view.write_line, f"Erro ao ler logs: {e}")
+            self._log_buffer.append(f"Erro ao ler logs: {e}\n")
+
+    async def on_unmount(self) -> None:
+        """Fecha o cliente HTTP também em desmontagens fora do action_quit."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
 
     async def action_quit(self) -> None:
         """Desliga limpo e fecha a TUI."""
-        self.stop_logging = True
+        self._shutdown.set()
+        # Um save de menu ainda na janela de debounce precisa chegar ao
+        # disco antes do loop morrer (o log já anunciou a gravação)
+        if self._save_task is not None and not self._save_task.done():
+            try:
+                await self._save_task
+            except asyncio.CancelledError:
+                pass
+        self.stop_log_tail()
+        if self._worker_proc is not None and self._worker_proc.returncode is None:
+            self._worker_proc.terminate()
         self.log_view.write_line("Encerrando bot e terminal...")
+        self._unwatch_external_pid()
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
         if self.telegram_controller and self.bot_task and not self.bot_task.done():
-            await self.telegram_controller.stop()
+            try:
+                await asyncio.wait_for(self.telegram_controller.stop(), timeout=2.0)
+            except asyncio.TimeoutError:
+                pass
             self.bot_task.cancel()
-            
+            # Espera a task finalizar de fato antes de derrubar o loop,
+            # evitando fds vazados e warnings de "task was destroyed"
+            try:
+                await asyncio.wait_for(self.bot_task, timeout=2.0)
+            except (asyncio.CancelledError, asyncio.TimeoutError):
+                pass
+
         self.exit()
 
 if __name__ == "__main__":
+    # uvloop (libuv) reduz o custo por callback do loop; no Windows (sem
+    # uvloop) o import falha e o loop padrão do asyncio segue em uso.
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     app = BotTerminalUI()
     app.run()
@@ -1,7 +1,51 @@
 import re
+import httpx
 import requests
-import json
-from typing import Generator
+import threading
+import time
+from typing import AsyncGenerator
+
+# orjson (C, SIMD) parses the small per-token frames several times
+# faster than the stdlib; fall back transparently when absent
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+# Compiled once: re.sub with a literal pattern would still pay a cache
+# lookup per streamed chunk on the hot per-token path.
+_THINK_RE = re.compile(r'<think>.*?</think>', re.DOTALL)
+
+# Call sites construct a fresh OllamaAdapter per use (e.g. the model
+# dropdown refresh), so anything meant to outlive one call must be
+# module-level: the tags memo and the pooled sessions, keyed by base_url
+# so multiple daemons don't mix.
+_models_cache: dict = {}
+_models_cache_lock = threading.Lock()
+
+_sessions: dict = {}
+_sessions_lock = threading.Lock()
+
+def _get_session(base_url: str) -> requests.Session:
+    with _sessions_lock:
+        session = _sessions.get(base_url)
+        if session is None:
+            session = requests.Session()
+            _sessions[base_url] = session
+    return session
+
+# Shared async client: one connection pool for all streamed generations,
+# created lazily on first use inside the running event loop.
+_async_client: httpx.AsyncClient = None
+
+def _get_async_client() -> httpx.AsyncClient:
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(120.0, connect=5.0),
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=8),
+        )
+    return _async_client
 
 class OllamaAdapter:
     """
@@ -19,18 +63,24 @@ class OllamaAdapter:
             Base URL of the Ollama API, by default "http://127.0.0.1:11434"
         """
         self.base_url = base_url.rstrip('/')
+        # Pooled session for the sync endpoints (keep-alive to the local
+        # Ollama daemon instead of a new TCP connection per call), shared
+        # per base_url across instances since adapters are short-lived
+        self._session = _get_session(self.base_url)
 
-    def generate_response(
-        self, 
-        model: str, 
-        prompt: str, 
-        system_prompt: str = "", 
-        temperature: float = 0.7, 
+    async def generate_response(
+        self,
+        model: str,
+        prompt: str,
+        system_prompt: str = "",
+        temperature: float = 0.7,
         max_tokens: int = 2048
-    ) -> Generator[str, None, None]:
+    ) -> AsyncGenerator[str, None]:
         """
         Generate a response from the Ollama model.
         Uses the /api/generate endpoint with streaming.
+        Async generator: awaits on the shared event loop instead of
+        blocking a thread per in-flight generation.
 
         Parameters
         ----------
@@ -78,26 +128,46 @@ class OllamaAdapter:
             }
         }
 
+        client = _get_async_client()
         try:
-            with requests.post(url, json=payload, stream=True, timeout=(5, 120)) as response:
+            # Explicit Accept keeps intermediaries from buffering the
+            # NDJSON stream like a regular response
+            async with client.stream(
+                "POST", url, json=payload,
+                headers={"Accept": "application/x-ndjson"},
+            ) as response:
                 response.raise_for_status()
-                
-                for line in response.iter_lines():
-                    if line:
-                        body = json.loads(line)
+
+                # Raw byte buffer split on newlines: one find() per NDJSON
+                # frame instead of per-byte line reconstruction.
+                buf = bytearray()
+                async for raw in response.aiter_bytes():
+                    buf += raw
+                    while True:
+                        nl = buf.find(b"\n")
+                        if nl < 0:
+                            break
+                        line = bytes(buf[:nl])
+                        del buf[:nl + 1]
+                        if not line or line == b"\r":
+                            continue
+                        body = _json.loads(line)
                         if "error" in body:
                             raise RuntimeError(f"Ollama API Error: {body['error']}")
-                        
+
                         if not body.get("done", False):
                             chunk = body.get("response", "")
-                            # Strip <think>...</think> tags from Qwen3 responses
-                            chunk = re.sub(r'<think>.*?</think>', '', chunk, flags=re.DOTALL)
+                            # Strip <think>...</think> tags from Qwen3 responses.
+                            # The substring test skips the regex entirely on
+                            # the vast majority of chunks.
+                            if '<think>' in chunk:
+                                chunk = _THINK_RE.sub('', chunk)
                             if chunk:
                                 yield chunk
-                            
-        except requests.exceptions.ConnectionError:
+
+        except httpx.ConnectError:
             raise ConnectionError(f"Could not connect to Ollama at {self.base_url}. Is it running?")
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             raise RuntimeError(f"Request failed: {e}")
 
     def list_models(self) -> list[str]:
@@ -109,12 +179,23 @@ class OllamaAdapter:
         list[str]
             List of model names.
         """
+        # TTL memo shared across adapter instances: the dropdown builds a
+        # new adapter per refresh, but the installed tags rarely change
+        with _models_cache_lock:
+            entry = _models_cache.get(self.base_url)
+        if entry and time.monotonic() - entry[0] < 30.0:
+            return entry[1]
+
         url = f"{self.base_url}/api/tags"
         try:
-            response = requests.get(url, timeout=5)
+            response = self._session.get(url, timeout=5)
             response.raise_for_status()
-            data = response.json()
-            return [model['name'] for model in data.get('models', [])]
+            data = _json.loads(response.content)
+            models = [model['name'] for model in data.get('models', [])]
+            if models:
+                with _models_cache_lock:
+                    _models_cache[self.base_url] = (time.monotonic(), models)
+            return models
         except Exception as e:
             print(f"Error fetching models: {e}")
             return []
@@ -1,6 +1,70 @@
+import httpx
 import requests
-import json
-from typing import Generator
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncGenerator
+
+# orjson (C, SIMD) parses the small per-token SSE frames several times
+# faster than the stdlib; fall back transparently when absent
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+# Advertise brotli only when it can actually be decoded locally;
+# /models and embeddings responses shrink several-fold compressed
+try:
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip, deflate"
+
+# Call sites construct a fresh OpenRouterAdapter per command, so anything
+# meant to outlive one call must be module-level: the TTL memo for
+# list_models/get_balance and the pooled sessions, both keyed by api_key
+# so different keys never mix.
+_ttl_cache: dict = {}
+_ttl_cache_lock = threading.Lock()
+
+_sessions: dict = {}
+_sessions_lock = threading.Lock()
+
+def _get_session(api_key: str) -> requests.Session:
+    with _sessions_lock:
+        session = _sessions.get(api_key)
+        if session is None:
+            session = requests.Session()
+            if api_key:
+                session.headers["Authorization"] = f"Bearer {api_key}"
+            session.headers.update({
+                "Content-Type": "application/json",
+                "HTTP-Referer": "https://github.com/demusis/atendimento_alunos_bot",
+                "Accept-Encoding": _ACCEPT_ENCODING,
+            })
+            session.mount("https://openrouter.ai", requests.adapters.HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=16,
+                max_retries=requests.adapters.Retry(
+                    total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504]
+                ),
+            ))
+            _sessions[api_key] = session
+    return session
+
+# Shared async client: the pool (and the openrouter.ai TLS session) is
+# reused across all streamed generations.
+_async_client: httpx.AsyncClient = None
+
+def _get_async_client() -> httpx.AsyncClient:
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=8),
+        )
+    return _async_client
 
 class OpenRouterAdapter:
     """
@@ -19,37 +83,111 @@ class OpenRouterAdapter:
         self.api_key = api_key
         self.base_url = "https://openrouter.ai/api/v1"
 
-    def get_embeddings(self, model: str, texts: list[str]) -> list[list[float]]:
-        """
-        Get embeddings for a list of texts using OpenRouter.
-        """
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
+        # Pooled session: the openrouter.ai TLS connection is reused
+        # across /models, /credits, /auth/key and /embeddings calls
+        # instead of paying a new TCP+TLS handshake per request. Shared
+        # per api_key across instances, since adapters are short-lived.
+        self._session = _get_session(api_key)
+
+        # Headers for the async streaming path, built once (the shared
+        # httpx client is process-wide, so auth travels per request)
+        self._sse_headers = {
+            "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
             "HTTP-Referer": "https://github.com/demusis/atendimento_alunos_bot",
+            # Declare the streaming intent explicitly so intermediaries
+            # don't buffer the event stream end-to-end
+            "Accept": "text/event-stream",
+            "Cache-Control": "no-cache",
         }
-        
+
+    def _cache_get(self, key: str, ttl: float):
+        """Return the cached value for `key` if younger than `ttl`, else None.
+
+        Backed by the module-level TTL memo so repeated TUI/bot refreshes
+        hit it even though each command builds a new adapter.
+        """
+        with _ttl_cache_lock:
+            entry = _ttl_cache.get((self.api_key, key))
+        if entry and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        return None
+
+    def _cache_put(self, key: str, value) -> None:
+        with _ttl_cache_lock:
+            _ttl_cache[(self.api_key, key)] = (time.monotonic(), value)
+
+    def _embed_batch(self, model: str, batch: list[str]) -> list[list[float]]:
+        """
+        Embed a single batch, retrying once with backoff if rate-limited.
+        """
         payload = {
             "model": model,
-            "input": texts
+            "input": batch
         }
-        
-        response = requests.post(f"{self.base_url}/embeddings", headers=headers, json=payload, timeout=20)
+
+        response = self._session.post(f"{self.base_url}/embeddings", json=payload, timeout=20)
+        if response.status_code == 429:
+            time.sleep(1.0)
+            response = self._session.post(f"{self.base_url}/embeddings", json=payload, timeout=20)
         response.raise_for_status()
-        
-        data = response.json()
+
+        data = _json.loads(response.content)
         return [item["embedding"] for item in data["data"]]
 
-    def generate_response(
-        self, 
-        model: str, 
-        prompt: str, 
-        system_prompt: str = "", 
-        temperature: float = 0.7, 
+    def get_embeddings(
+        self,
+        model: str,
+        texts: list[str],
+        batch_size: int = 96,
+        max_workers: int = 4
+    ) -> list[list[float]]:
+        """
+        Get embeddings for a list of texts using OpenRouter.
+
+        Large inputs are split into batches embedded concurrently, so K
+        batches cost roughly one round-trip instead of K, and a single
+        oversized payload never hits server input limits.
+
+        Parameters
+        ----------
+        model : str
+            Embedding model ID.
+        texts : list[str]
+            Texts to embed.
+        batch_size : int, optional
+            Maximum inputs per request, by default 96.
+        max_workers : int, optional
+            Concurrent in-flight requests, by default 4.
+
+        Returns
+        -------
+        list[list[float]]
+            One embedding per input text, in input order.
+        """
+        if len(texts) <= batch_size:
+            return self._embed_batch(model, texts)
+
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        embeddings: list[list[float]] = []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+            # executor.map preserves input order, keeping text/embedding alignment
+            for result in executor.map(partial(self._embed_batch, model), batches):
+                embeddings.extend(result)
+        return embeddings
+
+    async def generate_response(
+        self,
+        model: str,
+        prompt: str,
+        system_prompt: str = "",
+        temperature: float = 0.7,
         max_tokens: int = 2048
-    ) -> Generator[str, None, None]:
+    ) -> AsyncGenerator[str, None]:
         """
         Generate a response from OpenRouter using OpenAI-compatible API.
+        Async generator: awaits on the shared event loop instead of
+        blocking a thread per in-flight generation.
 
         Parameters
         ----------
@@ -70,12 +208,7 @@ class OpenRouterAdapter:
             Chunks of generated text.
         """
         url = f"{self.base_url}/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://github.com/demusis/atendimento_alunos_bot",
-        }
-        
+
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
@@ -89,30 +222,42 @@ class OpenRouterAdapter:
             "max_tokens": max_tokens
         }
 
+        client = _get_async_client()
         try:
-            with requests.post(url, headers=headers, json=payload, stream=True, timeout=(5, 60)) as response:
+            async with client.stream("POST", url, headers=self._sse_headers, json=payload) as response:
                 response.raise_for_status()
-                
-                for line in response.iter_lines():
-                    if line:
-                        line_str = line.decode('utf-8')
-                        if line_str.startswith("data: "):
-                            data_str = line_str[6:] # Strip "data: "
-                            
-                            if data_str.strip() == "[DONE]":
-                                break
-                                
-                            try:
-                                body = json.loads(data_str)
-                                choices = body.get("choices", [])
-                                if choices:
-                                    delta = choices[0].get("delta", {})
-                                    content = delta.get("content", "")
-                                    if content:
-                                        yield content
-                            except json.JSONDecodeError:
-                                pass
-                                
+
+                # Raw byte buffer split on newlines: one find() per SSE
+                # event, parsing the JSON straight from bytes (no decode)
+                buf = bytearray()
+                async for raw in response.aiter_bytes():
+                    buf += raw
+                    while True:
+                        nl = buf.find(b"\n")
+                        if nl < 0:
+                            break
+                        line = bytes(buf[:nl]).rstrip(b"\r")
+                        del buf[:nl + 1]
+                        if not line.startswith(b"data: "):
+                            continue
+                        data = line[6:] # Strip "data: "
+
+                        if data.strip() == b"[DONE]":
+                            return
+
+                        try:
+                            body = _json.loads(data)
+                            # Direct indexing: the delta shape is fixed, so
+                            # the rare comment/keep-alive frame pays the
+                            # exception instead of every token paying .get()s
+                            content = body["choices"][0]["delta"].get("content")
+                        except (ValueError, LookupError):
+                            # ValueError: malformed JSON (either parser);
+                            # LookupError: frame without choices/delta
+                            continue
+                        if content:
+                            yield content
+
         except Exception as e:
             raise RuntimeError(f"OpenRouter API Error: {e}")
 
@@ -125,29 +270,36 @@ class OpenRouterAdapter:
         list[str]
             Sorted list of model IDs (e.g., "openai/gpt-4o").
         """
+        cached = self._cache_get("models", 300.0)
+        if cached is None:
+            # Fallback cached for less time, so a transient outage
+            # doesn't pin the curated list for 5 minutes
+            cached = self._cache_get("models_fallback", 60.0)
+        if cached is not None:
+            return cached
+
         url = f"{self.base_url}/models"
-        headers = {}
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-            
         try:
-            response = requests.get(url, headers=headers, timeout=15)
+            response = self._session.get(url, timeout=15)
             response.raise_for_status()
-            data = response.json()
-            
+            # orjson shim: /models is hundreds of KB, the parse dominates here
+            data = _json.loads(response.content)
+
             models = []
             for model in data.get("data", []):
                 model_id = model.get("id", "")
                 if model_id:
                     models.append(model_id)
-            
+
             if models:
-                return sorted(models)
+                models = sorted(models)
+                self._cache_put("models", models)
+                return models
         except Exception as e:
             print(f"Erro ao buscar modelos do OpenRouter: {e}")
-        
+
         # Fallback: curated list if API fails
-        return [
+        fallback = [
             "openai/gpt-4o-mini",
             "openai/gpt-4o",
             "anthropic/claude-3-haiku",
@@ -158,6 +310,8 @@ class OpenRouterAdapter:
             "mistralai/mistral-7b-instruct",
             "deepseek/deepseek-chat",
         ]
+        self._cache_put("models_fallback", fallback)
+        return fallback
 
     def get_balance(self) -> dict:
         """
@@ -168,10 +322,10 @@ class OpenRouterAdapter:
         dict
             Dictionary containing credits and usage data.
         """
-        headers = {}
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-            
+        cached = self._cache_get("balance", 30.0)
+        if cached is not None:
+            return cached
+
         result = {
             "total_credits": 0.0,
             "total_usage": 0.0,
@@ -180,18 +334,22 @@ class OpenRouterAdapter:
             "usage_weekly": 0.0,
             "usage_monthly": 0.0
         }
-        
+
         try:
-            # Get credits
-            cred_resp = requests.get(f"{self.base_url}/credits", headers=headers, timeout=10)
+            # /credits and /auth/key are independent: fired concurrently,
+            # the wall time is one round-trip instead of two
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                cred_future = executor.submit(self._session.get, f"{self.base_url}/credits", timeout=10)
+                key_future = executor.submit(self._session.get, f"{self.base_url}/auth/key", timeout=10)
+                cred_resp = cred_future.result()
+                key_resp = key_future.result()
+
             if cred_resp.ok:
-                cred_data = cred_resp.json().get("data", {})
+                cred_data = _json.loads(cred_resp.content).get("data", {})
                 result["total_credits"] = cred_data.get("total_credits", 0.0)
-            
-            # Get key usage stats
-            key_resp = requests.get(f"{self.base_url}/auth/key", headers=headers, timeout=10)
+
             if key_resp.ok:
-                key_data = key_resp.json().get("data", {})
+                key_data = _json.loads(key_resp.content).get("data", {})
                 result["total_usage"] = key_data.get("usage", 0.0)
                 result["usage_daily"] = key_data.get("usage_daily", 0.0)
                 result["usage_weekly"] = key_data.get("usage_weekly", 0.0)
@@ -201,8 +359,9 @@ class OpenRouterAdapter:
                     result["total_usage"] = cred_data.get("total_usage", 0.0)
 
             result["balance"] = max(0.0, result["total_credits"] - result["total_usage"])
+            self._cache_put("balance", result)
         except Exception as e:
             print(f"Erro ao buscar saldo do OpenRouter: {e}")
-            
+
         return result
 
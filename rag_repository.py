@@ -16,27 +16,349 @@ if sys.platform == "linux":
         import sqlite3
         logger.info(f"pysqlite3 não disponível. Usando sqlite3 nativo (SQLite {sqlite3.sqlite_version})")
 
+import hashlib
 import shutil
+import sqlite3
+import struct
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import List, Optional, Dict, Any
+
+import httpx
+import numpy as np
 from langchain_community.document_loaders import PyPDFLoader, CSVLoader, TextLoader, Docx2txtLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_ollama import OllamaEmbeddings
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 
+# Pages per streaming window in ingest_file; caps peak memory at one
+# window's pages plus their chunks instead of the whole file
+_INGEST_WINDOW_PAGES = 50
+
+# PDFs at or above this page count are parsed in parallel page-range
+# slices; below it the fork/pickle overhead outweighs the parse time
+_PARALLEL_PDF_MIN_PAGES = 200
+
+# Splitters memoized per (chunk_size, chunk_overlap): module-level so
+# both the in-process path and each ProcessPool worker reuse theirs
+# across files instead of rebuilding the separator regexes every call
+_splitter_cache: Dict[tuple, RecursiveCharacterTextSplitter] = {}
+
+def _get_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    key = (chunk_size, chunk_overlap)
+    splitter = _splitter_cache.get(key)
+    if splitter is None:
+        splitter = _splitter_cache.setdefault(
+            key,
+            RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        )
+    return splitter
+
+def _make_loader(file_path: str):
+    """
+    Return the document loader matching the file extension.
+
+    Raises
+    ------
+    ValueError
+        If the file type is unsupported.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+
+    if ext == ".pdf":
+        return PyPDFLoader(file_path)
+    elif ext == ".csv":
+        return CSVLoader(file_path)
+    elif ext == ".docx":
+        return Docx2txtLoader(file_path)
+    elif ext in (".txt", ".md"):
+        return TextLoader(file_path, encoding='utf-8')
+    raise ValueError(f"Tipo de arquivo não suportado: '{ext}'")
+
+def _load_and_split(file_path: str, chunk_size: int, chunk_overlap: int) -> List[Document]:
+    """
+    Load one file and split it into chunks.
+
+    Top-level (not a method) so it is picklable and can run in worker
+    processes during bulk ingestion.
+
+    Parameters
+    ----------
+    file_path : str
+        Absolute path to the file.
+    chunk_size : int
+        Size of text chunks.
+    chunk_overlap : int
+        Overlap between chunks.
+
+    Returns
+    -------
+    List[Document]
+        The split chunks.
+    """
+    documents = _make_loader(file_path).load()
+    return _get_splitter(chunk_size, chunk_overlap).split_documents(documents)
+
+def _parse_pdf_pages(file_path: str, start: int, end: int) -> List[Document]:
+    """
+    Parse pages [start, end) of a PDF into per-page Documents.
+
+    Top-level (picklable) so page ranges can be parsed in worker
+    processes: PyPDF2 page extraction is serial Python CPU work, but
+    pages are independent, so slices scale across cores.
+    """
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(file_path)
+    docs: List[Document] = []
+    for i in range(start, end):
+        text = reader.pages[i].extract_text() or ""
+        docs.append(Document(
+            page_content=text,
+            metadata={"source": file_path, "page": i}
+        ))
+    return docs
+
+class EmbeddingCache:
+    """
+    SQLite-backed persistent cache of embeddings, keyed by
+    sha256(model + text). Re-ingesting unchanged content costs a hash
+    and an indexed lookup instead of a provider round-trip.
+
+    Vectors are stored quantized according to `dtype`: "f16" (default)
+    halves blob bytes with no retrieval-precision loss, "i8" quarters
+    them with a per-vector scale, "f32" keeps them verbatim. Each blob
+    carries a one-byte format tag, so entries written under a different
+    setting still decode correctly.
+    """
+
+    _DTYPES = ("f32", "f16", "i8")
+
+    def __init__(self, path: str, dtype: str = "f16"):
+        if dtype not in self._DTYPES:
+            raise ValueError(f"cache_dtype inválido: '{dtype}' (use f32, f16 ou i8)")
+        self.dtype = dtype
+        # check_same_thread=False: consulted from embedding worker threads,
+        # serialized by the lock below
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS emb(key BLOB PRIMARY KEY, vec BLOB)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model: str, text: str) -> bytes:
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).digest()
+
+    def _encode(self, vec: List[float]) -> bytes:
+        arr = np.asarray(vec, dtype=np.float32)
+        if self.dtype == "i8":
+            # Symmetric per-vector quantization: scale travels in the blob
+            scale = float(np.max(np.abs(arr))) / 127.0
+            if scale == 0.0:
+                scale = 1.0
+            q = np.round(arr / scale).astype(np.int8)
+            return b"\x02" + struct.pack("<f", scale) + q.tobytes()
+        if self.dtype == "f16":
+            return b"\x01" + arr.astype(np.float16).tobytes()
+        return b"\x00" + arr.tobytes()
+
+    @staticmethod
+    def _decode(blob: bytes) -> Optional[List[float]]:
+        tag, body = blob[:1], blob[1:]
+        if tag == b"\x00":
+            return np.frombuffer(body, dtype=np.float32).tolist()
+        if tag == b"\x01":
+            return np.frombuffer(body, dtype=np.float16).astype(np.float32).tolist()
+        if tag == b"\x02":
+            scale = struct.unpack("<f", body[:4])[0]
+            return (np.frombuffer(body[4:], dtype=np.int8).astype(np.float32) * scale).tolist()
+        # Unknown format (e.g. pre-tag entry): treat as a cache miss so
+        # it gets recomputed and rewritten in the current format
+        return None
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, List[float]]:
+        """Return the cached subset of `keys` as {key: vector}."""
+        found: Dict[bytes, List[float]] = {}
+        with self._lock:
+            # IN-list chunked at 500 to stay under SQLite's bind limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vec FROM emb WHERE key IN ({placeholders})", chunk
+                )
+                for key, blob in rows:
+                    vec = self._decode(blob)
+                    if vec is not None:
+                        found[key] = vec
+        return found
+
+    def put_many(self, items: List[tuple]) -> None:
+        """Store (key, vector) pairs, replacing existing entries."""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO emb(key, vec) VALUES (?, ?)",
+                [(k, self._encode(v)) for k, v in items],
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class FileIndex:
+    """
+    Sidecar SQLite table of ingested files, updated alongside every
+    vector store write. Listing files and counting chunks read O(files)
+    rows here instead of scanning every chunk's metadata through Chroma.
+    """
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files("
+            "filename TEXT PRIMARY KEY, chunk_count INT, ingested_at REAL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def record_many(self, items: List[tuple]) -> None:
+        """Store (filename, chunk_count) pairs, replacing existing entries."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO files(filename, chunk_count, ingested_at) VALUES (?, ?, ?)",
+                [(name, count, now) for name, count in items],
+            )
+            self._conn.commit()
+
+    def remove(self, filename: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM files WHERE filename = ?", (filename,))
+            self._conn.commit()
+
+    def list_files(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT filename FROM files ORDER BY filename")
+            return [row[0] for row in rows]
+
+    def stats(self) -> tuple:
+        """Return (file_count, chunk_count) totals."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(chunk_count), 0) FROM files"
+            ).fetchone()
+        return (row[0], row[1])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class BatchedOllamaEmbeddings(Embeddings):
+    """
+    Embeddings class for Ollama's native batch endpoint (/api/embed).
+    LangChain's OllamaEmbeddings loops text-by-text against the legacy
+    /api/embeddings endpoint; here a whole batch travels in one request,
+    so ingestion pays one round-trip per batch_size chunks. Falls back
+    to the legacy per-text endpoint on servers without /api/embed.
+    """
+    def __init__(
+        self,
+        model: str,
+        base_url: str = "http://127.0.0.1:11434",
+        batch_size: int = 64,
+        max_inflight: int = 4,
+        cache: Optional[EmbeddingCache] = None
+    ):
+        self.model = model
+        self.base_url = base_url.rstrip('/')
+        self.batch_size = batch_size
+        self.max_inflight = max_inflight
+        self.cache = cache
+        # Keep-alive client reused across batches of the same ingest
+        self._client = httpx.Client(timeout=120.0)
+
+    def _embed_batch(self, batch: List[str]) -> List[List[float]]:
+        """Embed one batch with a single /api/embed round-trip."""
+        response = self._client.post(
+            f"{self.base_url}/api/embed",
+            json={"model": self.model, "input": batch},
+        )
+        response.raise_for_status()
+        embeddings = response.json().get("embeddings")
+        if not embeddings or len(embeddings) != len(batch):
+            raise ValueError("Resposta do /api/embed sem o campo 'embeddings' esperado.")
+        return embeddings
+
+    def _embed_legacy(self, texts: List[str]) -> List[List[float]]:
+        """Fallback for Ollama versions without /api/embed: one call per text."""
+        out: List[List[float]] = []
+        for text in texts:
+            response = self._client.post(
+                f"{self.base_url}/api/embeddings",
+                json={"model": self.model, "prompt": text},
+            )
+            response.raise_for_status()
+            out.append(response.json()["embedding"])
+        return out
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.cache is None:
+            return self._embed_uncached(texts)
+
+        keys = [EmbeddingCache.make_key(self.model, t) for t in texts]
+        hits = self.cache.get_many(keys)
+        miss_idx = [i for i, k in enumerate(keys) if k not in hits]
+        if miss_idx:
+            new_vecs = self._embed_uncached([texts[i] for i in miss_idx])
+            self.cache.put_many([(keys[i], v) for i, v in zip(miss_idx, new_vecs)])
+            for i, v in zip(miss_idx, new_vecs):
+                hits[keys[i]] = v
+        return [hits[k] for k in keys]
+
+    def _embed_uncached(self, texts: List[str]) -> List[List[float]]:
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        try:
+            if len(batches) <= 1:
+                return self._embed_batch(texts) if texts else []
+
+            # Bounded in-flight batches: batch k+1's network time overlaps
+            # batch k's server compute without stampeding the provider
+            embeddings: List[List[float]] = []
+            with ThreadPoolExecutor(max_workers=min(self.max_inflight, len(batches))) as executor:
+                # executor.map preserves batch order
+                for result in executor.map(self._embed_batch, batches):
+                    embeddings.extend(result)
+            return embeddings
+        except (httpx.HTTPStatusError, ValueError):
+            logger.warning("Endpoint /api/embed indisponível; usando /api/embeddings legado.")
+            return self._embed_legacy(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
 class OpenRouterEmbeddings(Embeddings):
     """
     Custom Embeddings class for OpenRouter.
+    Batching, concurrency and rate-limit retry live in the adapter's
+    get_embeddings, shared with every other caller.
     """
-    def __init__(self, model: str, api_key: str):
+    def __init__(self, model: str, api_key: str, batch_size: int = 64, max_workers: int = 8):
         self.model = model
         self.api_key = api_key
+        self.batch_size = batch_size
+        self.max_workers = max_workers
         from openrouter_client import OpenRouterAdapter
         self.adapter = OpenRouterAdapter(api_key=api_key)
 
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        return self.adapter.get_embeddings(self.model, texts)
+        return self.adapter.get_embeddings(
+            self.model, texts,
+            batch_size=self.batch_size, max_workers=self.max_workers
+        )
 
     def embed_query(self, text: str) -> List[float]:
         return self.adapter.get_embeddings(self.model, [text])[0]
@@ -52,7 +374,10 @@ class VectorStoreRepository:
         model_name: str = "nomic-embed-text",
         provider: str = "ollama",
         api_key: str = "",
-        base_url: str = "http://127.0.0.1:11434"
+        base_url: str = "http://127.0.0.1:11434",
+        max_inflight: int = 4,
+        chroma_write_batch_size: int = 128,
+        cache_dtype: str = "f16"
     ) -> None:
         """
         Initialize the VectorStoreRepository.
@@ -69,21 +394,44 @@ class VectorStoreRepository:
             OpenRouter API Key if provider is "openrouter".
         base_url : str, optional
             Base URL for Ollama API.
+        max_inflight : int, optional
+            Maximum concurrent embedding batches, by default 4.
+        chroma_write_batch_size : int, optional
+            Documents per add_documents call, by default 128.
+        cache_dtype : str, optional
+            On-disk format of cached embeddings ("f32", "f16" or "i8"),
+            by default "f16". Only affects the cache layer; vectors
+            handed to Chroma stay float32.
         """
         if persist_directory is None:
             appdata = os.path.join(os.path.expanduser("~"), ".atendimento_bot")
             persist_directory = os.path.join(appdata, "chroma_db")
-            os.makedirs(persist_directory, exist_ok=True)
-        
+        os.makedirs(persist_directory, exist_ok=True)
+
         self.persist_directory = persist_directory
-        
+        self.chroma_write_batch_size = chroma_write_batch_size
+
+        # Cached embeddings survive next to the Chroma data they refer to
+        self.embedding_cache = EmbeddingCache(
+            os.path.join(persist_directory, "embedding_cache.sqlite"),
+            dtype=cache_dtype
+        )
+        self.file_index = FileIndex(
+            os.path.join(persist_directory, "files.sqlite")
+        )
+
         if provider == "openrouter":
-            self.embedding_function = OpenRouterEmbeddings(model=model_name, api_key=api_key)
+            self.embedding_function = OpenRouterEmbeddings(
+                model=model_name, api_key=api_key, max_workers=max_inflight
+            )
         else:
-            self.embedding_function = OllamaEmbeddings(model=model_name, base_url=base_url)
+            self.embedding_function = BatchedOllamaEmbeddings(
+                model=model_name, base_url=base_url, max_inflight=max_inflight,
+                cache=self.embedding_cache
+            )
             
         self.vector_store: Optional[Chroma] = None
-        
+
         # Initialize/Load DB
         self._load_db()
 
@@ -96,6 +444,48 @@ class VectorStoreRepository:
             embedding_function=self.embedding_function
         )
 
+    def _add_documents_batched(self, splits: List[Document]) -> None:
+        """
+        Write chunks to Chroma in tuned batches.
+
+        A single huge add_documents call hits pathological per-batch
+        overhead in Chroma's segment layer, while tiny writes pay full
+        transaction cost each; ~100-250 documents per call is the sweet
+        spot.
+        """
+        batch = self.chroma_write_batch_size
+        for i in range(0, len(splits), batch):
+            self.vector_store.add_documents(documents=splits[i:i + batch])
+
+    def _iter_pdf_pages_parallel(self, file_path: str):
+        """
+        Yield a large PDF's pages, parsed as parallel page-range slices.
+
+        Returns None for small PDFs or single-core machines, where the
+        fork/pickle overhead beats the parse time — the caller then
+        keeps the serial lazy_load path. Slices are consumed in
+        submission order, so page order is preserved.
+        """
+        from PyPDF2 import PdfReader
+
+        n_pages = len(PdfReader(file_path).pages)
+        workers = max(1, (os.cpu_count() or 2) - 1)
+        if n_pages < _PARALLEL_PDF_MIN_PAGES or workers < 2:
+            return None
+
+        step = -(-n_pages // workers)  # ceil division
+
+        def _generate():
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(_parse_pdf_pages, file_path, start, min(start + step, n_pages))
+                    for start in range(0, n_pages, step)
+                ]
+                for future in futures:
+                    yield from future.result()
+
+        return _generate()
+
     def ingest_file(self, file_path: str, chunk_size: int = 2000, chunk_overlap: int = 400) -> Dict[str, Any]:
         """
         Ingest a file into the vector store.
@@ -127,48 +517,120 @@ class VectorStoreRepository:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
 
-        ext = os.path.splitext(file_path)[1].lower()
-        loader = None
-        
+        if not self.vector_store:
+            raise RuntimeError("Vector Store não inicializado.")
+
         try:
-            if ext == ".pdf":
-                loader = PyPDFLoader(file_path)
-            elif ext == ".csv":
-                loader = CSVLoader(file_path)
-            elif ext == ".docx":
-                loader = Docx2txtLoader(file_path)
-            elif ext in (".txt", ".md"):
-                loader = TextLoader(file_path, encoding='utf-8')
-            else:
-                raise ValueError(f"Tipo de arquivo não suportado: '{ext}'")
+            loader = _make_loader(file_path)
+            text_splitter = _get_splitter(chunk_size, chunk_overlap)
+
+            # Pages stream through the splitter in rolling windows: only
+            # one window's pages and chunks are resident at a time, so a
+            # 2000-page PDF no longer holds two full-text copies in RAM.
+            # The splitter works per document, so windowing does not
+            # change the resulting chunks.
+            chunks_count = 0
+            window: List[Document] = []
+
+            def _flush(window: List[Document]) -> int:
+                splits = text_splitter.split_documents(window)
+                self._add_documents_batched(splits)
+                return len(splits)
+
+            # Very large PDFs swap the serial page source for parallel
+            # page-range parsing; everything downstream (window flushes,
+            # batched writes) is unchanged
+            pages = None
+            if os.path.splitext(file_path)[1].lower() == ".pdf":
+                pages = self._iter_pdf_pages_parallel(file_path)
+            if pages is None:
+                pages = loader.lazy_load()
+
+            for page in pages:
+                window.append(page)
+                if len(window) >= _INGEST_WINDOW_PAGES:
+                    chunks_count += _flush(window)
+                    window = []
+            if window:
+                chunks_count += _flush(window)
+
+            self.file_index.record_many([(os.path.basename(file_path), chunks_count)])
+            logger.info(f"Ingestão de '{os.path.basename(file_path)}' concluída com sucesso ({chunks_count} fragmentos).")
+            return {
+                "status": "success",
+                "chunks_count": chunks_count,
+                "filename": os.path.basename(file_path)
+            }
 
-            # Load
-            documents = loader.load()
-            
-            # Split
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=chunk_size, 
-                chunk_overlap=chunk_overlap
-            )
-            splits = text_splitter.split_documents(documents)
-            
-            # Add to Vector Store
-            if self.vector_store:
-                logger.info(f"Adicionando {len(splits)} fragmentos ao Vector Store...")
-                self.vector_store.add_documents(documents=splits)
-                logger.info(f"Ingestão de '{os.path.basename(file_path)}' concluída com sucesso.")
-                return {
-                    "status": "success",
-                    "chunks_count": len(splits),
-                    "filename": os.path.basename(file_path)
-                }
-            else:
-                raise RuntimeError("Vector Store não inicializado.")
-                
         except Exception as e:
             raise RuntimeError(f"Erro na ingestão do arquivo: {str(e)}") from e
 
-    def query_context(self, query_text: str, n_results: int = 4) -> List[Document]:
+    def ingest_files(self, file_paths: List[str], chunk_size: int = 2000, chunk_overlap: int = 400) -> Dict[str, Any]:
+        """
+        Ingest several files at once, parsing and splitting in parallel.
+
+        PDF parsing and text splitting are CPU-bound and independent per
+        file, so they fan out across worker processes; the resulting
+        chunks are embedded and written in one combined pass instead of
+        one ingest per file.
+
+        Parameters
+        ----------
+        file_paths : List[str]
+            Absolute paths of the files to ingest.
+        chunk_size : int, optional
+            Size of text chunks, by default 2000.
+        chunk_overlap : int, optional
+            Overlap between chunks, by default 400.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Dictionary with 'status', 'chunks_count', 'files_count' and
+            a per-file 'errors' list.
+        """
+        if not self.vector_store:
+            raise RuntimeError("Vector Store não inicializado.")
+
+        # ProcessPoolExecutor(max_workers=0) raises ValueError
+        if not file_paths:
+            return {
+                "status": "success",
+                "chunks_count": 0,
+                "files_count": 0,
+                "errors": [],
+            }
+
+        all_splits: List[Document] = []
+        per_file_counts: List[tuple] = []
+        errors: List[str] = []
+        workers = min(max(1, (os.cpu_count() or 2) - 1), len(file_paths))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_load_and_split, path, chunk_size, chunk_overlap)
+                for path in file_paths
+            ]
+            for path, future in zip(file_paths, futures):
+                try:
+                    splits = future.result()
+                    per_file_counts.append((os.path.basename(path), len(splits)))
+                    all_splits.extend(splits)
+                except Exception as e:
+                    errors.append(f"{os.path.basename(path)}: {e}")
+
+        if all_splits:
+            logger.info(f"Adicionando {len(all_splits)} fragmentos ao Vector Store...")
+            self._add_documents_batched(all_splits)
+            self.file_index.record_many(per_file_counts)
+
+        return {
+            "status": "success" if not errors else "partial",
+            "chunks_count": len(all_splits),
+            "files_count": len(file_paths) - len(errors),
+            "errors": errors,
+        }
+
+    def query_context(self, query_text: str, n_results: int = 4, use_mmr: bool = False) -> List[Document]:
         """
         Retrieve relevant documents for a given query.
 
@@ -178,6 +640,11 @@ class VectorStoreRepository:
             The query string.
         n_results : int, optional
             Number of results to return, by default 4.
+        use_mmr : bool, optional
+            Re-rank with maximal marginal relevance, by default False.
+            Trades a slightly wider search (fetch_k = 4x) for diversity,
+            so near-duplicate chunks from one source stop crowding out
+            the context window.
 
         Returns
         -------
@@ -186,8 +653,17 @@ class VectorStoreRepository:
         """
         if not self.vector_store:
             return []
-            
-        return self.vector_store.similarity_search(query_text, k=n_results)
+
+        # Embedding computed explicitly so it flows through the persistent
+        # embedding cache before the vector search
+        embedding = self.embedding_function.embed_query(query_text)
+        if use_mmr:
+            docs = self.vector_store.max_marginal_relevance_search_by_vector(
+                embedding, k=n_results, fetch_k=4 * n_results, lambda_mult=0.5
+            )
+        else:
+            docs = self.vector_store.similarity_search_by_vector(embedding, k=n_results)
+        return docs
 
     def clear_database(self) -> str:
         """
@@ -201,11 +677,24 @@ class VectorStoreRepository:
         """
         try:
             if os.path.exists(self.persist_directory):
-                # We need to close the connection if possible, but Chroma doesn't 
+                # We need to close the connection if possible, but Chroma doesn't
                 # expose an explicit close() easily in this wrapper.
                 # shutil.rmtree is the most effective way to RESET the dimension.
+                # The embedding cache lives in the same directory; release its
+                # handle before the tree goes away and reopen after.
+                self.embedding_cache.close()
+                self.file_index.close()
                 shutil.rmtree(self.persist_directory)
                 os.makedirs(self.persist_directory, exist_ok=True)
+                self.embedding_cache = EmbeddingCache(
+                    os.path.join(self.persist_directory, "embedding_cache.sqlite"),
+                    dtype=self.embedding_cache.dtype
+                )
+                self.file_index = FileIndex(
+                    os.path.join(self.persist_directory, "files.sqlite")
+                )
+                if getattr(self.embedding_function, "cache", None) is not None:
+                    self.embedding_function.cache = self.embedding_cache
                 # Re-load an empty DB
                 self._load_db()
                 return "Banco de dados resetado completamente (inclusive dimensões)."
@@ -224,23 +713,46 @@ class VectorStoreRepository:
         """
         if not self.vector_store:
             return []
-            
+
         try:
-            data = self.vector_store.get()
-            metadatas = data.get('metadatas', [])
-            
-            unique_sources = set()
-            for meta in metadatas:
-                if meta and 'original_filename' in meta:
-                    unique_sources.add(meta['original_filename'])
-                elif meta and 'source' in meta:
-                    # Fallback to basename of source path
-                    unique_sources.add(os.path.basename(str(meta['source'])))
-            
-            return sorted(list(unique_sources))
+            files = self.file_index.list_files()
+            if files:
+                return files
+            # Empty sidecar: either a truly empty store or a database
+            # created before the index existed — rebuild it from one scan.
+            return self._rebuild_file_index()
         except Exception as e:
             print(f"Error listing documents: {e}")
             return []
+
+    def _rebuild_file_index(self) -> List[str]:
+        """
+        Rebuild the file sidecar from a full metadata scan.
+
+        Only runs for databases that predate the sidecar; after the
+        one-time backfill, reads never touch Chroma again.
+
+        Returns
+        -------
+        List[str]
+            Sorted unique filenames found in the store.
+        """
+        # Only metadata crosses the Chroma boundary; the full chunk
+        # texts (part of the default include) stay on the other side
+        data = self.vector_store.get(include=["metadatas"])
+        metadatas = data.get('metadatas', [])
+
+        counts: Dict[str, int] = {}
+        for meta in metadatas:
+            if not meta:
+                continue
+            source = meta.get('original_filename') or os.path.basename(str(meta.get('source', '')))
+            if source:
+                counts[source] = counts.get(source, 0) + 1
+
+        if counts:
+            self.file_index.record_many(sorted(counts.items()))
+        return sorted(counts)
     def delete_document(self, filename: str) -> Dict[str, Any]:
         """
         Delete a document and all its chunks from the vector store.
@@ -259,10 +771,11 @@ class VectorStoreRepository:
             return {"ok": False, "error": "Vector Store não inicializado."}
             
         try:
-            data = self.vector_store.get()
+            # ids always come back; metadata-only include skips the chunk texts
+            data = self.vector_store.get(include=["metadatas"])
             ids = data.get('ids', [])
             metadatas = data.get('metadatas', [])
-            
+
             ids_to_delete = []
             for i, meta in enumerate(metadatas):
                 if not meta:
@@ -275,6 +788,7 @@ class VectorStoreRepository:
             
             if ids_to_delete:
                 self.vector_store.delete(ids=ids_to_delete)
+                self.file_index.remove(filename)
                 return {
                     "ok": True, 
                     "deleted_count": len(ids_to_delete),
@@ -302,21 +816,15 @@ class VectorStoreRepository:
             return {"file_count": 0, "chunk_count": 0}
             
         try:
-            data = self.vector_store.get()
-            ids = data.get('ids', [])
-            metadatas = data.get('metadatas', [])
-            
-            unique_files = set()
-            for meta in metadatas:
-                if not meta:
-                    continue
-                source = meta.get('original_filename') or os.path.basename(str(meta.get('source', '')))
-                if source:
-                    unique_files.add(source)
-            
+            file_count, chunk_count = self.file_index.stats()
+            if file_count == 0:
+                # Possibly a pre-sidecar database: backfill, then re-read
+                if self._rebuild_file_index():
+                    file_count, chunk_count = self.file_index.stats()
+
             return {
-                "file_count": len(unique_files),
-                "chunk_count": len(ids)
+                "file_count": file_count,
+                "chunk_count": chunk_count
             }
         except Exception as e:
             print(f"Error getting stats: {e}")
@@ -1742,9 +1742,9 @@ class TelegramBotController:
             else:
                  gen = self.ollama_adapter.generate_response(model, prompt, temperature=0.3, max_tokens=1000)
                  
-            for chunk in gen:
+            async for chunk in gen:
                 response_text += chunk
-                
+
             await update.message.reply_text(f"🤖 **Insight IA**\n\n{response_text}", parse_mode="Markdown") # type: ignore
             
         except Exception as e:
@@ -1787,9 +1787,9 @@ class TelegramBotController:
             else:
                  gen = self.ollama_adapter.generate_response(model, prompt, temperature=0.3, max_tokens=1000)
                  
-            for chunk in gen:
+            async for chunk in gen:
                 response_text += chunk
-            
+
             if not response_text:
                 await query.edit_message_text(text="⚠️ A IA não retornou um resumo para os logs analisados.")
                 return
@@ -2119,7 +2119,7 @@ class TelegramBotController:
                 )
             
             chunk_count = 0
-            for chunk in generator:
+            async for chunk in generator:
                 if chunk_count == 0:
                      logger.info("Primeiro fragmento recebido da IA.")
                 response_text += chunk